@@ -0,0 +1,27 @@
+"""Chroma-safe collection naming shared by the memory stores."""
+
+import hashlib
+import re
+
+# Chroma restricts collection names to alphanumerics plus ._- with an
+# alphanumeric start and end. The stores prefix every name with their base
+# collection name, so only the namespace suffix needs encoding here.
+_UNSAFE_CHARS = re.compile(r"[^a-zA-Z0-9._-]")
+
+
+def collection_suffix(namespace: str) -> str:
+    """Encode a namespace as a Chroma-safe collection name suffix.
+
+    Namespaces like "crm_support/coddy001" contain characters Chroma rejects
+    in collection names, so unsafe characters are rewritten to "-" and a
+    short digest of the original namespace is appended to keep distinct
+    namespaces from colliding after the rewrite. Over-long namespaces are
+    truncated the same way so the full name stays inside Chroma's 63-char
+    limit. Short already-safe namespaces pass through unchanged, so existing
+    collections keep their names.
+    """
+    safe = _UNSAFE_CHARS.sub("-", namespace)
+    if safe == namespace and 0 < len(namespace) <= 40 and namespace[-1].isalnum():
+        return namespace
+    digest = hashlib.blake2b(namespace.encode(), digest_size=4).hexdigest()
+    return f"{safe[:40].rstrip('._-')}-{digest}"
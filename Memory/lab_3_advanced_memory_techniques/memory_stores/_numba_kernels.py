@@ -0,0 +1,55 @@
+"""Optional numba-accelerated rerank kernel for the episodic store.
+
+When numba is installed the combine step runs as a JIT-compiled loop;
+otherwise a vectorized NumPy fallback with identical results is used.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def _combine_scores_numpy(similarity, recency, frequency, a_sim, a_rec, a_freq):
+    raw = a_sim * similarity + a_rec * recency + a_freq * frequency
+    sigma = raw.std() or 1.0
+    return 1.0 / (1.0 + np.exp(-(raw - raw.mean()) / sigma))
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _combine_scores_jit(similarity, recency, frequency, a_sim, a_rec, a_freq):
+        n = similarity.shape[0]
+        raw = np.empty(n, dtype=np.float64)
+        mean = 0.0
+        for i in range(n):
+            raw[i] = a_sim * similarity[i] + a_rec * recency[i] + a_freq * frequency[i]
+            mean += raw[i]
+        mean /= n
+
+        var = 0.0
+        for i in range(n):
+            d = raw[i] - mean
+            var += d * d
+        sigma = (var / n) ** 0.5
+        if sigma == 0.0:
+            sigma = 1.0
+
+        for i in range(n):
+            raw[i] = 1.0 / (1.0 + np.exp(-(raw[i] - mean) / sigma))
+        return raw
+
+    combine_scores = _combine_scores_jit
+
+    def warmup():
+        """Trigger JIT compilation once so the first real query isn't slow."""
+        z = np.zeros(2, dtype=np.float64)
+        _combine_scores_jit(z, z, z, 1.0, 0.0, 0.0)
+else:
+    combine_scores = _combine_scores_numpy
+
+    def warmup():
+        """No-op without numba."""
@@ -1,111 +1,282 @@
 """Episodic Memory Store - Vector store for experiences, past interactions with recency bias."""
 
+import asyncio
+import atexit
+import threading
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 import chromadb
+import numpy as np
 from langchain_openai import OpenAIEmbeddings
 
+from ._naming import collection_suffix
+from ._numba_kernels import combine_scores, warmup as _warmup_kernels
+
+
+def _ts_epoch(meta: Dict[str, Any]) -> float:
+    """Epoch seconds for a memory, falling back to the ISO timestamp for old docs."""
+    epoch = meta.get("ts_epoch")
+    if epoch:
+        return epoch
+    timestamp_str = meta.get("timestamp", "")
+    if timestamp_str:
+        try:
+            return datetime.fromisoformat(timestamp_str.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            pass
+    return 0.0
+
 
 class EpisodicMemoryStore:
-    """Vector store for experiences, past interactions with recency bias."""
-    
-    def __init__(self, embeddings: OpenAIEmbeddings, collection_name: str = "episodic", persist_dir: str = "./chroma_db"):
+    """Vector store for experiences, past interactions with recency bias.
+
+    Storage, distance math, and HNSW traversal all scale linearly with the
+    embedding dimension, so prefer a reduced-dimension embedder, e.g.
+    OpenAIEmbeddings(model="text-embedding-3-small", dimensions=512). Passing
+    embeddings=None builds exactly that (override the size via dimensions=).
+    """
+
+    def __init__(self, embeddings: Optional[OpenAIEmbeddings] = None, collection_name: str = "episodic", persist_dir: str = "./chroma_db",
+                 half_life_days: float = 30.0, alpha_similarity: float = 0.7, alpha_recency: float = 0.3,
+                 alpha_frequency: float = 0.1,
+                 buffer_writes: bool = False, buffer_size: int = 100, flush_interval: float = 2.0,
+                 hnsw_params: Optional[Dict[str, Any]] = None, dimensions: int = 512):
+        if embeddings is None:
+            embeddings = OpenAIEmbeddings(model="text-embedding-3-small", dimensions=dimensions)
         self.client = chromadb.PersistentClient(path=persist_dir)
-        self.collection = self.client.get_or_create_collection(
-            name=collection_name,
-            metadata={"hnsw:space": "cosine"}
-        )
+        # Collection metadata shared by every namespace collection. The HNSW
+        # defaults favor latency over recall (episodic reads tolerate a miss);
+        # override via hnsw_params. For the biggest query-side win, rebuild the
+        # index lib with SIMD: pip install --no-binary :all: chroma-hnswlib.
+        self._collection_metadata = {
+            "hnsw:space": "cosine",
+            "hnsw:M": 32,
+            "hnsw:construction_ef": 200,
+            "hnsw:search_ef": 32
+        }
+        if hnsw_params:
+            self._collection_metadata.update(hnsw_params)
+        # Rerank parameters: recency decays with a half-life (2^(-age/h)) and
+        # the alphas set the similarity/recency/frequency mix before normalization.
+        self.half_life_days = half_life_days
+        self.alpha_similarity = alpha_similarity
+        self.alpha_recency = alpha_recency
+        self.alpha_frequency = alpha_frequency
+        self.base_name = collection_name
+        # One collection per namespace so HNSW only searches that namespace's
+        # vectors instead of over-fetching and post-filtering with `where`.
+        self._collections: Dict[str, Any] = {}
         self.embeddings = embeddings
-    
+        # Per-instance LRU cache so repeated queries (e.g. the same last user
+        # turn hitting multiple read nodes) skip the OpenAI round-trip.
+        self._embed_query_cached = lru_cache(maxsize=1024)(embeddings.embed_query)
+        # Optional write buffer: puts accumulate and flush as one batch once
+        # buffer_size items are pending or flush_interval seconds pass,
+        # amortizing embedding calls and HNSW inserts over the whole batch.
+        self.buffer_writes = buffer_writes
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._buffer: Dict[str, List[Tuple[str, str, Optional[Dict[str, Any]], float]]] = {}
+        self._buffer_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        if buffer_writes:
+            atexit.register(self.flush)
+        # Compile the rerank kernel now (no-op without numba) so the first
+        # search doesn't pay the JIT cost.
+        _warmup_kernels()
+
+    def _col(self, namespace: str):
+        """Lazily get or create the collection for a namespace."""
+        col = self._collections.get(namespace)
+        if col is None:
+            col = self.client.get_or_create_collection(
+                name=f"{self.base_name}_{collection_suffix(namespace)}",
+                metadata=self._collection_metadata
+            )
+            self._collections[namespace] = col
+        return col
+
     def put(self, namespace: str, key: str, content: str, metadata: Dict[str, Any] = None, salience_score: float = 1.0):
         """Store an episodic memory (only if salience_score > threshold)."""
-        doc_id = f"{namespace}:{key}"
-        embedding = self.embeddings.embed_query(content)
-        
-        meta = metadata or {}
-        meta.update({
-            "namespace": namespace,
-            "key": key,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "type": "episodic",
-            "salience": salience_score
-        })
-        
-        self.collection.upsert(
-            ids=[doc_id],
-            embeddings=[embedding],
-            documents=[content],
-            metadatas=[meta]
+        self.put_many(namespace, [(key, content, metadata, salience_score)])
+
+    def put_many(self, namespace: str, items: List[Tuple[str, str, Optional[Dict[str, Any]], float]]):
+        """Store multiple episodic memories with a single embedding call and upsert.
+
+        Each item is a (key, content, metadata, salience_score) tuple. Batching the
+        embedding request avoids one OpenAI round-trip per memory. With
+        buffer_writes enabled, items queue up and are written by flush().
+        """
+        if not items:
+            return
+
+        if self.buffer_writes:
+            with self._buffer_lock:
+                self._buffer.setdefault(namespace, []).extend(items)
+                pending = sum(len(buf) for buf in self._buffer.values())
+                if self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+            if pending >= self.buffer_size:
+                self.flush()
+            return
+
+        self._write_batch(namespace, items)
+
+    def flush(self):
+        """Write all buffered memories, one batch per namespace."""
+        with self._buffer_lock:
+            buffered = self._buffer
+            self._buffer = {}
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        for namespace, items in buffered.items():
+            if items:
+                self._write_batch(namespace, items)
+
+    def _write_batch(self, namespace: str, items: List[Tuple[str, str, Optional[Dict[str, Any]], float]]):
+        """Embed and upsert a batch of memories into the namespace collection."""
+        embeddings = self.embeddings.embed_documents([content for _, content, _, _ in items])
+        now = datetime.now(timezone.utc)
+        timestamp = now.isoformat()
+        ts_epoch = now.timestamp()
+
+        ids = []
+        documents = []
+        metadatas = []
+        for key, content, metadata, salience_score in items:
+            meta = dict(metadata or {})
+            meta.update({
+                "namespace": namespace,
+                "key": key,
+                "timestamp": timestamp,
+                "ts_epoch": ts_epoch,
+                "type": "episodic",
+                "salience": salience_score
+            })
+            ids.append(f"{namespace}:{key}")
+            documents.append(content)
+            metadatas.append(meta)
+
+        self._col(namespace).upsert(
+            ids=ids,
+            embeddings=embeddings,
+            documents=documents,
+            metadatas=metadatas
         )
-    
-    def search(self, namespace: str, query: str, top_k: int = 5, recency_weight: float = 0.3) -> List[Dict[str, Any]]:
-        """Semantic search with recency bias."""
-        query_embedding = self.embeddings.embed_query(query)
-        
-        # Get more results than needed for reranking
-        results = self.collection.query(
+
+    def search(self, namespace: str, query: str, top_k: int = 5, record_access: bool = True) -> List[Dict[str, Any]]:
+        """Semantic search with recency and frequency bias.
+
+        Unless record_access is False, returned memories get their
+        retrieval_count incremented and last_retrieved_at refreshed so
+        frequently-recalled experiences rank higher over time.
+        """
+        # Keep read-your-writes semantics when buffering is on
+        if self.buffer_writes:
+            self.flush()
+
+        query_embedding = self._embed_query_cached(query)
+
+        results = self._col(namespace).query(
             query_embeddings=[query_embedding],
-            n_results=top_k * 2,
-            where={"namespace": namespace}
+            n_results=top_k
         )
-        
-        memories = []
-        for i, doc_id in enumerate(results["ids"][0]):
-            meta = results["metadatas"][0][i]
-            timestamp_str = meta.get("timestamp", "")
-            
-            # Recency score (0-1, 1 = most recent)
-            recency_score = 0.0
-            if timestamp_str:
-                try:
-                    ts = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-                    age_days = (datetime.now(timezone.utc) - ts).total_seconds() / 86400
-                    recency_score = 1.0 / (1.0 + age_days / 30)  # Decay over 30 days
-                except:
-                    pass
-            
-            # Combined score: similarity (1-distance) + recency
-            similarity = 1.0 - results["distances"][0][i] if "distances" in results else 0.5
-            combined_score = (1 - recency_weight) * similarity + recency_weight * recency_score
-            
-            memories.append({
-                "id": doc_id,
-                "content": results["documents"][0][i],
-                "metadata": meta,
-                "similarity": similarity,
-                "recency_score": recency_score,
-                "combined_score": combined_score
-            })
-        
-        # Sort by combined score and return top_k
-        memories.sort(key=lambda x: x["combined_score"], reverse=True)
-        return memories[:top_k]
-    
+        return self._postprocess(namespace, results, record_access)
+
+    async def asearch(self, namespace: str, query: str, top_k: int = 5, record_access: bool = True) -> List[Dict[str, Any]]:
+        """Async variant of search; lets callers overlap independent retrievals."""
+        if self.buffer_writes:
+            self.flush()
+
+        query_embedding = await self.embeddings.aembed_query(query)
+        results = await asyncio.to_thread(
+            self._col(namespace).query,
+            query_embeddings=[query_embedding],
+            n_results=top_k
+        )
+        return self._postprocess(namespace, results, record_access)
+
+    def _postprocess(self, namespace: str, results: Dict[str, Any], record_access: bool) -> List[Dict[str, Any]]:
+        """Rerank raw Chroma query results by similarity, recency, and frequency."""
+        doc_ids = results["ids"][0]
+        if not doc_ids:
+            return []
+        metas = results["metadatas"][0]
+        documents = results["documents"][0]
+        n = len(doc_ids)
+
+        # Vectorized rerank: one NumPy pass instead of per-result Python math
+        now_epoch = datetime.now(timezone.utc).timestamp()
+        ts = np.fromiter((_ts_epoch(m) for m in metas), dtype=np.float64, count=n)
+        if "distances" in results:
+            similarity = 1.0 - np.asarray(results["distances"][0], dtype=np.float64)
+        else:
+            similarity = np.full(n, 0.5)
+
+        # Recency score (0-1, 1 = most recent) with exponential half-life decay;
+        # memories with no timestamp get 0
+        age_days = (now_epoch - ts) / 86400.0
+        recency = np.where(ts > 0, np.exp2(-age_days / self.half_life_days), 0.0)
+
+        # Frequency score: saturating log of how often a memory was retrieved
+        counts = np.fromiter((m.get("retrieval_count", 0) for m in metas), dtype=np.float64, count=n)
+        frequency = np.minimum(1.0, np.log1p(counts) / 10.0)
+
+        # Weighted sum, then z-score + sigmoid normalization so the ranking is
+        # stable regardless of the raw similarity scale of the corpus
+        # (JIT-compiled when numba is installed, NumPy otherwise)
+        combined = combine_scores(similarity, recency, frequency,
+                                  self.alpha_similarity, self.alpha_recency, self.alpha_frequency)
+        order = np.argsort(-combined)
+
+        if record_access:
+            now_iso = datetime.now(timezone.utc).isoformat()
+            self._col(namespace).update(
+                ids=doc_ids,
+                metadatas=[
+                    {**m, "retrieval_count": m.get("retrieval_count", 0) + 1, "last_retrieved_at": now_iso}
+                    for m in metas
+                ]
+            )
+
+        return [
+            {
+                "id": doc_ids[i],
+                "content": documents[i],
+                "metadata": metas[i],
+                "similarity": float(similarity[i]),
+                "recency_score": float(recency[i]),
+                "combined_score": float(combined[i])
+            }
+            for i in order
+        ]
+
     def delete(self, namespace: str, key: str):
         """Delete an episodic memory."""
         doc_id = f"{namespace}:{key}"
-        self.collection.delete(ids=[doc_id])
-    
+        self._col(namespace).delete(ids=[doc_id])
+
     def clear_namespace(self, namespace: str):
-        """Delete all memories in a namespace."""
-        # Get all IDs in the namespace
-        results = self.collection.get(where={"namespace": namespace})
-        if results["ids"]:
-            self.collection.delete(ids=results["ids"])
-    
+        """Delete all memories in a namespace with a single collection drop.
+
+        No ids are round-tripped through Python; dropping the namespace
+        collection is O(1) regardless of how many docs it holds.
+        """
+        self.client.delete_collection(name=self._col(namespace).name)
+        self._collections.pop(namespace, None)
+
     def clear_all(self):
-        """Delete all episodic memories (clears entire collection)."""
-        # Get all IDs
-        results = self.collection.get()
-        if results["ids"]:
-            self.collection.delete(ids=results["ids"])
-    
-    def delete_collection(self):
-        """Delete the entire collection (nuclear option)."""
-        self.client.delete_collection(name=self.collection.name)
-        # Recreate empty collection
-        self.collection = self.client.get_or_create_collection(
-            name=self.collection.name,
-            metadata={"hnsw:space": "cosine"}
-        )
+        """Delete all episodic memories (drops every namespace collection)."""
+        prefix = f"{self.base_name}_"
+        for col in self.client.list_collections():
+            if col.name.startswith(prefix):
+                self.client.delete_collection(name=col.name)
+        self._collections.clear()
 
+    def delete_collection(self):
+        """Delete all collections for this store (nuclear option)."""
+        self.clear_all()
@@ -1,57 +1,79 @@
 """Preference Memory Store - KV store for user preferences (tone, devices, communication style)."""
 
-import json
+import sqlite3
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 from pathlib import Path
 
+from utils.fast_json import dumps, loads
+
 
 class PreferenceMemoryStore:
     """KV store for user preferences (tone, devices, communication style).
-    
+
+    Backed by SQLite (WAL mode) so each put/delete is an O(log N) B-tree
+    write instead of re-serializing the whole preference file per write.
+
     NOTE: Preferences are written only via explicit calls (preference_store.put()).
     There is no automatic LLM-based preference detection. This is by design to
     ensure preferences are only set when explicitly requested by the user.
     """
-    
-    def __init__(self, file_path: str = "preferences.json"):
+
+    def __init__(self, file_path: str = "preferences.db"):
         self.file_path = Path(file_path)
-        self._load()
-    
-    def _load(self):
-        """Load preferences from disk."""
-        if self.file_path.exists():
-            with open(self.file_path, "r") as f:
-                self.data = json.load(f)
-        else:
-            self.data = {}
-    
-    def _save(self):
-        """Save preferences to disk."""
-        with open(self.file_path, "w") as f:
-            json.dump(self.data, f, indent=2)
-    
+        # check_same_thread=False so async callers can run reads via
+        # asyncio.to_thread; access is effectively serialized by the GIL and
+        # WAL handles concurrent readers
+        self.conn = sqlite3.connect(self.file_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS prefs (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )"""
+        )
+        self.conn.commit()
+        # Monotonic write counter; readers can cache "namespace is empty"
+        # results keyed on it and skip the query until something is written
+        self.version = 0
+
     def get(self, namespace: str, key: str) -> Optional[Any]:
         """Get a preference value."""
-        return self.data.get(namespace, {}).get(key)
-    
+        row = self.conn.execute(
+            "SELECT value, updated_at FROM prefs WHERE namespace = ? AND key = ?",
+            (namespace, key)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"value": loads(row[0]), "updated_at": row[1]}
+
     def get_all(self, namespace: str) -> Dict[str, Any]:
         """Get all preferences for a namespace."""
-        return self.data.get(namespace, {})
-    
+        rows = self.conn.execute(
+            "SELECT key, value, updated_at FROM prefs WHERE namespace = ?",
+            (namespace,)
+        ).fetchall()
+        return {key: {"value": loads(value), "updated_at": updated_at}
+                for key, value, updated_at in rows}
+
     def put(self, namespace: str, key: str, value: Any):
         """Set a preference value."""
-        if namespace not in self.data:
-            self.data[namespace] = {}
-        self.data[namespace][key] = {
-            "value": value,
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        }
-        self._save()
-    
+        self.conn.execute(
+            "INSERT OR REPLACE INTO prefs (namespace, key, value, updated_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, dumps(value), datetime.now(timezone.utc).isoformat())
+        )
+        self.conn.commit()
+        self.version += 1
+
     def delete(self, namespace: str, key: str):
         """Delete a preference."""
-        if namespace in self.data and key in self.data[namespace]:
-            del self.data[namespace][key]
-            self._save()
-
+        self.conn.execute(
+            "DELETE FROM prefs WHERE namespace = ? AND key = ?",
+            (namespace, key)
+        )
+        self.conn.commit()
+        self.version += 1
@@ -1,8 +1,12 @@
 """Procedural Memory - Structured prompts and rules for agent behavior."""
 
-import json
+import pickle
 from datetime import datetime
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from utils.fast_json import dumps
 
 
 class ProceduralMemory:
@@ -101,8 +105,49 @@ class ProceduralMemory:
         return None
     
     @classmethod
+    def _static_rule_texts(cls) -> List[str]:
+        """Flatten the static escalation/diagnostic rules into seedable texts."""
+        texts = [
+            f"Escalation rule ({name}): if {rule['threshold']} then {rule['action']}. {rule['message']}"
+            for name, rule in cls.ESCALATION_RULES.items()
+        ]
+        texts.append("Diagnostic order: " + " ".join(cls.DIAGNOSTIC_ORDER))
+        return texts
+
+    @classmethod
+    def seed_semantic(cls, store, namespace: str, cache_path: str = "procedural_embeddings.pkl"):
+        """Seed the static rules into a semantic store without embedding API calls.
+
+        Embeddings for the rule texts are computed once and pickled to
+        cache_path; subsequent seedings (e.g. every notebook restart) reuse the
+        cached vectors via put_with_embedding.
+        """
+        rules = cls._static_rule_texts()
+        cache_file = Path(cache_path)
+
+        embeddings = None
+        if cache_file.exists():
+            with open(cache_file, "rb") as f:
+                cached = pickle.load(f)
+            # Only reuse the cache if the rule texts haven't changed
+            if cached.get("rules") == rules:
+                embeddings = cached["embeddings"]
+
+        if embeddings is None:
+            embeddings = store.embeddings.embed_documents(rules)
+            with open(cache_file, "wb") as f:
+                pickle.dump({"rules": rules, "embeddings": embeddings}, f)
+
+        for i, (text, embedding) in enumerate(zip(rules, embeddings)):
+            store.put_with_embedding(
+                namespace, f"procedural_rule_{i}", text, embedding,
+                metadata={"source": "procedural_seed"}
+            )
+
+    @classmethod
+    @lru_cache(maxsize=1)
     def get_procedural_prompt(cls) -> str:
-        """Get structured procedural instructions."""
+        """Get structured procedural instructions (built once, then cached)."""
         return f"""
         You are a CRM support agent following structured procedures:
 
@@ -110,7 +155,7 @@ class ProceduralMemory:
         {chr(10).join(cls.DIAGNOSTIC_ORDER)}
 
         TOOL USAGE RULES:
-        {json.dumps(cls.TOOL_USAGE_RULES, indent=2)}
+        {dumps(cls.TOOL_USAGE_RULES, indent=True)}
 
         ESCALATION RULES:
         - Critical priority → escalate immediately
@@ -1,104 +1,204 @@
 """Semantic Memory Store - Vector store for facts, domain knowledge, structured data."""
 
+import asyncio
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 import chromadb
 from langchain_openai import OpenAIEmbeddings
 
+from ._naming import collection_suffix
+
 
 class SemanticMemoryStore:
-    """Vector store for facts, domain knowledge, structured data."""
-    
-    def __init__(self, embeddings: OpenAIEmbeddings, collection_name: str = "semantic", persist_dir: str = "./chroma_db"):
+    """Vector store for facts, domain knowledge, structured data.
+
+    Storage, distance math, and HNSW traversal all scale linearly with the
+    embedding dimension, so prefer a reduced-dimension embedder, e.g.
+    OpenAIEmbeddings(model="text-embedding-3-small", dimensions=512). Passing
+    embeddings=None builds exactly that (override the size via dimensions=).
+    """
+
+    def __init__(self, embeddings: Optional[OpenAIEmbeddings] = None, collection_name: str = "semantic", persist_dir: str = "./chroma_db",
+                 hnsw_params: Optional[Dict[str, Any]] = None, dimensions: int = 512):
+        if embeddings is None:
+            embeddings = OpenAIEmbeddings(model="text-embedding-3-small", dimensions=dimensions)
         self.client = chromadb.PersistentClient(path=persist_dir)
-        self.collection = self.client.get_or_create_collection(
-            name=collection_name,
-            metadata={"hnsw:space": "cosine"}
-        )
+        # Collection metadata shared by every namespace collection. The HNSW
+        # defaults favor precision (facts should not be missed); override via
+        # hnsw_params. For the biggest query-side win, rebuild the index lib
+        # with SIMD: pip install --no-binary :all: chroma-hnswlib.
+        self._collection_metadata = {
+            "hnsw:space": "cosine",
+            "hnsw:M": 32,
+            "hnsw:construction_ef": 200,
+            "hnsw:search_ef": 64
+        }
+        if hnsw_params:
+            self._collection_metadata.update(hnsw_params)
+        self.base_name = collection_name
+        # One collection per namespace so HNSW only searches that namespace's
+        # vectors instead of over-fetching and post-filtering with `where`.
+        self._collections: Dict[str, Any] = {}
         self.embeddings = embeddings
-    
+        # Per-instance LRU cache so repeated queries (e.g. the same last user
+        # turn hitting multiple read nodes) skip the OpenAI round-trip.
+        self._embed_query_cached = lru_cache(maxsize=1024)(embeddings.embed_query)
+        # Monotonic write counter; callers that cache derived results (e.g.
+        # the planner's plan cache) include it in their keys so any write
+        # invalidates stale entries.
+        self.version = 0
+
+    def _col(self, namespace: str):
+        """Lazily get or create the collection for a namespace."""
+        col = self._collections.get(namespace)
+        if col is None:
+            col = self.client.get_or_create_collection(
+                name=f"{self.base_name}_{collection_suffix(namespace)}",
+                metadata=self._collection_metadata
+            )
+            self._collections[namespace] = col
+        return col
+
     def put(self, namespace: str, key: str, content: str, metadata: Dict[str, Any] = None):
         """Store or update a semantic memory."""
-        doc_id = f"{namespace}:{key}"
-        embedding = self.embeddings.embed_query(content)
-        
-        meta = metadata or {}
+        self.put_many(namespace, [(key, content, metadata)])
+
+    def put_many(self, namespace: str, items: List[Tuple[str, str, Optional[Dict[str, Any]]]]):
+        """Store or update multiple semantic memories with a single embedding call.
+
+        Each item is a (key, content, metadata) tuple. Batching the embedding
+        request avoids one OpenAI round-trip per memory.
+        """
+        if not items:
+            return
+
+        embeddings = self.embeddings.embed_documents([content for _, content, _ in items])
+        timestamp = datetime.now(timezone.utc).isoformat()
+
+        ids = []
+        documents = []
+        metadatas = []
+        for key, content, metadata in items:
+            meta = dict(metadata or {})
+            meta.update({
+                "namespace": namespace,
+                "key": key,
+                "timestamp": timestamp,
+                "type": "semantic"
+            })
+            ids.append(f"{namespace}:{key}")
+            documents.append(content)
+            metadatas.append(meta)
+
+        # Upsert (overwrites if exists)
+        self._col(namespace).upsert(
+            ids=ids,
+            embeddings=embeddings,
+            documents=documents,
+            metadatas=metadatas
+        )
+        self.version += 1
+
+    def put_with_embedding(self, namespace: str, key: str, content: str, embedding: List[float], metadata: Dict[str, Any] = None):
+        """Store a semantic memory with a precomputed embedding (no OpenAI call).
+
+        Used for static content (e.g. procedural rule seeding) where the
+        embedding can be computed once and cached offline.
+        """
+        meta = dict(metadata or {})
         meta.update({
             "namespace": namespace,
             "key": key,
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "type": "semantic"
         })
-        
-        # Upsert (overwrites if exists)
-        self.collection.upsert(
-            ids=[doc_id],
+
+        self._col(namespace).upsert(
+            ids=[f"{namespace}:{key}"],
             embeddings=[embedding],
             documents=[content],
             metadatas=[meta]
         )
-    
+        self.version += 1
+
     def get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
         """Retrieve a specific semantic memory."""
         doc_id = f"{namespace}:{key}"
-        results = self.collection.get(ids=[doc_id])
+        results = self._col(namespace).get(ids=[doc_id])
         if results["ids"]:
             return {
                 "content": results["documents"][0],
                 "metadata": results["metadatas"][0]
             }
         return None
-    
+
     def search(self, namespace: str, query: str, top_k: int = 5, filters: Dict = None) -> List[Dict[str, Any]]:
         """Semantic search with metadata filtering."""
-        query_embedding = self.embeddings.embed_query(query)
-        
-        where = {"namespace": namespace}
-        if filters:
-            where.update(filters)
-        
-        results = self.collection.query(
+        query_embedding = self._embed_query_cached(query)
+
+        results = self._col(namespace).query(
+            query_embeddings=[query_embedding],
+            n_results=top_k,
+            where=filters if filters else None
+        )
+        return self._to_memories(results)
+
+    async def asearch(self, namespace: str, query: str, top_k: int = 5, filters: Dict = None) -> List[Dict[str, Any]]:
+        """Async variant of search; lets callers overlap independent retrievals."""
+        query_embedding = await self.embeddings.aembed_query(query)
+
+        results = await asyncio.to_thread(
+            self._col(namespace).query,
             query_embeddings=[query_embedding],
             n_results=top_k,
-            where=where if where else None
+            where=filters if filters else None
         )
-        
+        return self._to_memories(results)
+
+    @staticmethod
+    def _to_memories(results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Convert raw Chroma query results into memory dicts."""
+        documents = results["documents"][0]
+        metadatas = results["metadatas"][0]
+        distances = results["distances"][0] if "distances" in results else None
+
         memories = []
         for i, doc_id in enumerate(results["ids"][0]):
             memories.append({
                 "id": doc_id,
-                "content": results["documents"][0][i],
-                "metadata": results["metadatas"][0][i],
-                "distance": results["distances"][0][i] if "distances" in results else None
+                "content": documents[i],
+                "metadata": metadatas[i],
+                "distance": distances[i] if distances is not None else None
             })
-        
+
         return memories
-    
+
     def delete(self, namespace: str, key: str):
         """Delete a semantic memory."""
         doc_id = f"{namespace}:{key}"
-        self.collection.delete(ids=[doc_id])
-    
+        self._col(namespace).delete(ids=[doc_id])
+        self.version += 1
+
     def clear_namespace(self, namespace: str):
-        """Delete all memories in a namespace."""
-        # Get all IDs in the namespace
-        results = self.collection.get(where={"namespace": namespace})
-        if results["ids"]:
-            self.collection.delete(ids=results["ids"])
-    
+        """Delete all memories in a namespace with a single collection drop.
+
+        No ids are round-tripped through Python; dropping the namespace
+        collection is O(1) regardless of how many docs it holds.
+        """
+        self.client.delete_collection(name=self._col(namespace).name)
+        self._collections.pop(namespace, None)
+        self.version += 1
+
     def clear_all(self):
-        """Delete all semantic memories (clears entire collection)."""
-        # Get all IDs
-        results = self.collection.get()
-        if results["ids"]:
-            self.collection.delete(ids=results["ids"])
-    
-    def delete_collection(self):
-        """Delete the entire collection (nuclear option)."""
-        self.client.delete_collection(name=self.collection.name)
-        # Recreate empty collection
-        self.collection = self.client.get_or_create_collection(
-            name=self.collection.name,
-            metadata={"hnsw:space": "cosine"}
-        )
+        """Delete all semantic memories (drops every namespace collection)."""
+        prefix = f"{self.base_name}_"
+        for col in self.client.list_collections():
+            if col.name.startswith(prefix):
+                self.client.delete_collection(name=col.name)
+        self._collections.clear()
+        self.version += 1
 
+    def delete_collection(self):
+        """Delete all collections for this store (nuclear option)."""
+        self.clear_all()
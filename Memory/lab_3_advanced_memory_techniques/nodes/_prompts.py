@@ -0,0 +1,73 @@
+"""Shared prompt fragments, built once at import.
+
+Keeping the tool-extraction boilerplate in one place avoids drift between
+nodes and keeps the cacheable prompt prefix byte-identical across calls.
+"""
+
+# Cap per-memory prompt length so one oversized memory can't inflate every
+# subsequent LLM call
+_MAX_MEM_CHARS = 240
+
+
+def _fmt_mem(memory) -> str:
+    """Render one memory as a prompt bullet, truncated to _MAX_MEM_CHARS."""
+    content = memory.get("content") if isinstance(memory, dict) else str(memory)
+    content = content or ""
+    if len(content) > _MAX_MEM_CHARS:
+        content = content[:_MAX_MEM_CHARS - 1] + "…"
+    return "- " + content
+
+
+def format_memories(memories) -> str:
+    """Render memory contents as prompt bullets (first 5, each length-capped)."""
+    return "\n".join(map(_fmt_mem, memories[:5])) or "None"
+
+
+TOOL_EXTRACTION_BLOCK = """TOOL SELECTION AND ARGUMENT EXTRACTION:
+
+1. For create_ticket (if in allowed_tools):
+   - REQUIRED: Extract customer_name from messages like "I'm X" or "Hi, I'm X"
+   - REQUIRED: Extract issue from the problem description
+   - OPTIONAL: Extract device if mentioned, otherwise use "-"
+   - OPTIONAL: priority (default: "Medium")
+   - Only use if NO tickets exist in memories or conversation history
+   - Example: {"tool": "create_ticket", "arguments": {"customer_name": "Cody", "issue": "slow internet speeds", "device": "-", "priority": "Medium"}}
+
+2. For update_ticket (if in allowed_tools):
+   - REQUIRED: Extract ticket_id from semantic memories (shown above) or conversation history
+   - Look for ticket_id in semantic memories - they may contain text like "ticket_id: 998880" or "Ticket 998880"
+   - OPTIONAL: Extract note from new information provided in the user's message
+   - OPTIONAL: Extract device if mentioned
+   - OPTIONAL: Extract status if mentioned
+   - Use when tickets exist in semantic memories AND user provides additional details
+   - Example: {"tool": "update_ticket", "arguments": {"ticket_id": "998880", "note": "Customer tried restarting modem"}}
+
+3. For lookup_ticket (if in allowed_tools):
+   - REQUIRED: Extract ticket_id from semantic memories or user message
+   - If user says "my ticket" and ticket exists in semantic memories, use that ticket_id
+   - Example: {"tool": "lookup_ticket", "arguments": {"ticket_id": "998880"}}
+
+ARGUMENT EXTRACTION RULES:
+- Look through ALL conversation messages and semantic memories (shown above) to find:
+  * customer_name: patterns like "I'm X", "Hi, I'm X", "My name is X"
+  * issue: the problem description
+  * device: device models mentioned
+  * ticket_id: CRITICAL - Extract from semantic memories. Look for patterns like "ticket_id: 123456", "Ticket 123456", or "ticket 123456" in the semantic memories shown above
+- IMPORTANT: If semantic memories contain a ticket_id and the user provides additional information (device details, troubleshooting steps, updates), you MUST use update_ticket with that ticket_id
+- Extract arguments from the latest user message and relevant conversation history
+- If ticket_id is missing for update_ticket, check semantic memories again - they should contain the ticket information
+
+Return ONLY JSON (no other text):
+{
+  "tool": "create_ticket" | "update_ticket" | "lookup_ticket",
+  "arguments": {
+    "customer_name": "...",  // for create_ticket
+    "issue": "...",          // for create_ticket
+    "device": "...",         // optional
+    "priority": "Medium",    // optional for create_ticket
+    "ticket_id": "...",      // for lookup_ticket/update_ticket
+    "note": "...",           // optional for update_ticket
+    "status": "..."          // optional for update_ticket
+  }
+}
+"""
@@ -8,6 +8,9 @@ from langchain_core.messages import SystemMessage
 namespace = None
 semantic_store = None
 
+# Compiled once; re.search with a literal pattern would recompile per memory
+_TICKET_RE = re.compile(r'ticket[:\s#]*(\d+)')
+
 
 def conflict_resolution(state):
     """Resolve conflicts between tool output and memories. Tool output is authoritative."""
@@ -32,32 +35,43 @@ def conflict_resolution(state):
     if ticket.get("status"):
         verified_facts.append(f"Ticket {ticket_id} status: {ticket['status']}")
     
+    # Nothing to write and nothing to reconcile - skip the scans entirely
+    if not verified_facts and not semantic_memories:
+        return {"messages": [SystemMessage(content="Tool output verified. Nothing to reconcile.")]}
+
     # Detect conflicts: check if semantic memories contain conflicting information
     conflicts_detected = []
-    if semantic_memories:
-        # Check for conflicts with ticket ID, device, or customer name
+    device = ticket.get("device", "")
+    has_device = bool(device) and device != "-"
+    device_lower = device.lower() if has_device else ""
+    if semantic_memories and (ticket_id or has_device):
+        # Check for conflicts with ticket ID or device
         for memory in semantic_memories:
             memory_content = memory.get('content', '').lower()
             # Check for conflicting ticket IDs
             if ticket_id and f"ticket {ticket_id}" not in memory_content and "ticket" in memory_content:
                 # Extract ticket ID from memory if different
-                mem_ticket_match = re.search(r'ticket[:\s#]*(\d+)', memory_content)
+                mem_ticket_match = _TICKET_RE.search(memory_content)
                 if mem_ticket_match and mem_ticket_match.group(1) != ticket_id:
                     conflicts_detected.append(f"Ticket ID conflict: memory had {mem_ticket_match.group(1)}, tool verified {ticket_id}")
             # Check for conflicting device info
-            if ticket.get("device") and ticket.get("device") != "-":
-                device_lower = ticket.get("device", "").lower()
+            if has_device:
                 if device_lower not in memory_content and ("device" in memory_content or "router" in memory_content):
                     conflicts_detected.append(f"Device conflict detected in memory")
     
-    # Update semantic memory with tool-verified facts (overwrites any conflicting memories)
-    for fact in verified_facts:
-        # Use deterministic keys for overwrite
-        if ticket_id:
-            key = f"ticket_{ticket_id}_verified"
-        else:
-            key = f"tool_verified_{uuid.uuid4().hex[:8]}"
-        semantic_store.put(namespace, key, fact, metadata={"source": "tool_verified", "timestamp": datetime.now(timezone.utc).isoformat()})
+    # Update semantic memory with tool-verified facts (overwrites any conflicting
+    # memories). One put_many call batches the embedding request and the upsert.
+    if verified_facts:
+        now_iso = datetime.now(timezone.utc).isoformat()
+        items = []
+        for i, fact in enumerate(verified_facts):
+            # Use deterministic keys for overwrite
+            if ticket_id:
+                key = f"ticket_{ticket_id}_fact_{i}"
+            else:
+                key = f"tool_verified_{uuid.uuid4().hex[:8]}"
+            items.append((key, fact, {"source": "tool_verified", "timestamp": now_iso}))
+        semantic_store.put_many(namespace, items)
     
     # Build conflict message
     if conflicts_detected:
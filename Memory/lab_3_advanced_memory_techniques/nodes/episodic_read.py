@@ -1,5 +1,4 @@
 """Episodic memory read node."""
-from langchain_core.messages import SystemMessage
 
 # These will be set in the main notebook
 namespace = None
@@ -9,18 +8,29 @@ episodic_store = None
 def episodic_read(state):
     """Retrieve episodic memories (experiences, past interactions)."""
     query = state["messages"][-1].content if state["messages"] else ""
-    
+
     # Search episodic store with recency bias
     results = episodic_store.search(namespace, query, top_k=3)
-    
-    if not results:
-        return {"episodic_memories": []}
-    
-    memory_text = "Episodic memories (past experiences):\n"
-    memory_text += "\n".join([f"- {r['content']}" for r in results])
-    
-    return {
-        "episodic_memories": results,
-        "messages": [SystemMessage(content=memory_text)]
-    }
+
+    return _to_update(results)
+
+
+async def aepisodic_read(state):
+    """Async variant of episodic_read so the graph can overlap memory reads."""
+    query = state["messages"][-1].content if state["messages"] else ""
+
+    results = await episodic_store.asearch(namespace, query, top_k=3)
+
+    return _to_update(results)
+
+
+def _to_update(results):
+    """Build the state update from search results.
+
+    Memories ride in state only - no SystemMessage is appended, so past
+    turns' memory blocks don't accumulate in (and get re-sent with) the
+    message history. Downstream nodes render the current memories into
+    their own prompts exactly once.
+    """
+    return {"episodic_memories": results or []}
 
@@ -0,0 +1,68 @@
+"""Regex fast path for tool selection and argument extraction.
+
+Most guard decisions reduce to pattern matching: find a ticket_id in
+semantic memories, find "I'm X" / "My name is X", pick one of three tools
+by keyword. Deciding those in Python skips the LLM round-trip entirely;
+ambiguous turns still fall back to the LLM.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Compiled once at module scope; these run on every turn
+_TICKET_RE = re.compile(r"ticket[_\s:#]*(?:id[:\s#]*)?(\d+)", re.IGNORECASE)
+# Prefix matches case-insensitively but the captured name must be capitalized
+_NAME_RE = re.compile(r"\b(?i:i['’]m|my name is|hi,?\s*i['’]m)\s+([A-Z][a-z]+)")
+_DEVICE_RE = re.compile(r"((?:netgear|archer|nighthawk)[-\s]*[a-z0-9]*|router[-\s]+[a-z0-9]+)", re.IGNORECASE)
+_UPDATE_SIGNALS_RE = re.compile(r"\b(?:tried|still|restarted?|rebooted?|also|now it)\b", re.IGNORECASE)
+_STATUS_SIGNALS_RE = re.compile(r"\b(?:status|look\s*up|lookup|progress|any update|check(?:ing)? on)\b", re.IGNORECASE)
+
+
+def find_ticket_id(user_text: str, semantic_memories: List[Dict[str, Any]]) -> Optional[str]:
+    """Find a ticket id in the user message or, failing that, semantic memories."""
+    match = _TICKET_RE.search(user_text)
+    if match:
+        return match.group(1)
+    for memory in semantic_memories:
+        match = _TICKET_RE.search(memory.get("content", ""))
+        if match:
+            return match.group(1)
+    return None
+
+
+def fast_tool_plan(user_text: str, semantic_memories: List[Dict[str, Any]],
+                   allowed_tools: List[str]) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Pick a (tool, arguments) pair without the LLM when the turn is unambiguous.
+
+    Returns None when the signals conflict or are missing, in which case the
+    caller should fall back to llm.invoke.
+    """
+    if not user_text:
+        return None
+
+    ticket_id = find_ticket_id(user_text, semantic_memories)
+    device_match = _DEVICE_RE.search(user_text)
+
+    if ticket_id:
+        wants_status = bool(_STATUS_SIGNALS_RE.search(user_text))
+        has_update = bool(_UPDATE_SIGNALS_RE.search(user_text)) or device_match is not None
+        if wants_status and not has_update and "lookup_ticket" in allowed_tools:
+            return "lookup_ticket", {"ticket_id": ticket_id}
+        if has_update and not wants_status and "update_ticket" in allowed_tools:
+            arguments = {"ticket_id": ticket_id, "note": user_text.strip()}
+            if device_match:
+                arguments["device"] = device_match.group(1)
+            return "update_ticket", arguments
+        # Mixed or missing signals: let the LLM decide
+        return None
+
+    # No ticket anywhere: create, but only when the name is extractable
+    name_match = _NAME_RE.search(user_text)
+    if name_match and "create_ticket" in allowed_tools:
+        return "create_ticket", {
+            "customer_name": name_match.group(1),
+            "issue": user_text.strip(),
+            "device": device_match.group(1) if device_match else "-",
+            "priority": "Medium"
+        }
+
+    return None
@@ -8,26 +8,35 @@ dedicated preference update node) to store user preferences based on conversatio
 
 Note:Refer preference_store.py for more details.
 """
-from langchain_core.messages import SystemMessage
+import asyncio
 
 # These will be set in the main notebook
 namespace = None
 preference_store = None
 
+# Most sessions never write a preference, so once a namespace comes back
+# empty remember the store version it was empty at and skip the query until
+# something is written
+_empty_at_version = {}
+
 
 def preference_read(state):
     """Retrieve user preferences."""
-    prefs = preference_store.get_all(namespace)
-    
-    if not prefs:
+    version = getattr(preference_store, "version", None)
+    if version is not None and _empty_at_version.get(namespace) == version:
         return {"preferences": {}}
-    
-    prefs_text = "User preferences:\n"
-    for key, value_dict in prefs.items():
-        prefs_text += f"- {key}: {value_dict.get('value', 'N/A')}\n"
-    
-    return {
-        "preferences": prefs,
-        "messages": [SystemMessage(content=prefs_text)]
-    }
+
+    prefs = preference_store.get_all(namespace)
+
+    if not prefs and version is not None:
+        _empty_at_version[namespace] = version
+
+    # Preferences ride in state only - downstream nodes render them into
+    # their own prompts, so no SystemMessage accumulates in the history
+    return {"preferences": prefs}
+
+
+async def apreference_read(state):
+    """Async variant of preference_read so the graph can overlap memory reads."""
+    return await asyncio.to_thread(preference_read, state)
 
@@ -5,173 +5,156 @@ After planner selects a procedure, this node enforces the procedure's rules by s
 from allowed_tools and extracting required arguments. It also handles escalation detection and adds procedural
 context to messages for downstream nodes.
 """
-import json
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 from memory_stores.procedural_memory import ProceduralMemory
 from utils.extract_json import extract_json_from_response
+from utils.fast_json import dumps, loads
+
+from ._prompts import TOOL_EXTRACTION_BLOCK, format_memories
+from .fast_planner import fast_tool_plan
 
 # LLM will be set in the main notebook
 llm = None
 
+# TOOL_USAGE_RULES and PROCEDURES are static at import time; serialize the
+# rules and join the step lists once instead of per call
+_TOOL_RULES_TEXT = dumps(ProceduralMemory.TOOL_USAGE_RULES, indent=True)
+_PROCS = ProceduralMemory.PROCEDURES
+_STEPS_TEXT_CACHE = {pid: "\n".join(p["steps"]) for pid, p in _PROCS.items()}
+# Shared no-args sentinel for the fallback branches in _parse_plan: every
+# consumer (tool dispatch, plan serialization) treats arguments read-only, so
+# one dict serves all no-args plans instead of a fresh {} per fallback. A
+# MappingProxyType would enforce that, but the plan is serialized with
+# dumps(), and neither orjson nor stdlib json encodes mappingproxy.
+_EMPTY_ARGS: dict = {}
+# Tuples: immutable, no fresh default-list allocation per call, and faster
+# membership checks on the hot "selected_tool in allowed_tools" validation
+_ALLOWED_TOOLS_BY_PROC = {pid: tuple(p.get("allowed_tools", ())) for pid, p in _PROCS.items()}
+
+# Downstream procedural context per procedure, rendered once at import: the
+# name, steps, and tool rules never change, so there is no f-string
+# interpolation or join left on the per-call path
+_PROCEDURAL_PROMPT_BY_PROC = {
+    pid: f"""
+    You are following the {p.get('name', 'Unknown Procedure')} procedure.
+
+    STEPS:
+    {_STEPS_TEXT_CACHE[pid]}
+
+    TOOL USAGE RULES:
+    {_TOOL_RULES_TEXT}
+
+    You MUST follow this procedure. Do not deviate.
+    """
+    for pid, p in _PROCS.items()
+}
+
+# Static per-procedure instruction blocks, built lazily and reused so the
+# provider can cache the prefix across calls: Anthropic honors the
+# cache_control marker, OpenAI caches matching prefixes automatically. Only
+# the memory context changes between turns.
+_static_guard_messages = {}
 
-def procedural_guard(state):
-    """Enforce procedure rules: select tool and extract arguments based on selected procedure."""
-    selected_procedure = state.get("selected_procedure", "standard_support")
-    procedure = ProceduralMemory.PROCEDURES.get(selected_procedure, ProceduralMemory.PROCEDURES["standard_support"])
-    
-    # Get allowed tools for this procedure
-    allowed_tools = procedure.get("allowed_tools", [])
-    procedure_name = procedure.get('name', 'Unknown Procedure')
-    steps_text = "\n".join(procedure['steps'])
-    tool_rules_text = json.dumps(ProceduralMemory.TOOL_USAGE_RULES, indent=2)
-    
-    # Get context from state
-    semantic_memories = state.get("semantic_memories", [])
-    episodic_memories = state.get("episodic_memories", [])
-    
-    # Extract semantic memory content for the prompt
-    semantic_content = ""
-    if semantic_memories:
-        semantic_content = "\n".join([
-            f"- {mem.get('content', str(mem))}" 
-            for mem in semantic_memories[:5]
-        ])
-    else:
-        semantic_content = "None"
-    
-    # Extract episodic memory content for the prompt
-    episodic_content = ""
-    if episodic_memories:
-        episodic_content = "\n".join([
-            f"- {mem.get('content', str(mem))}" 
-            for mem in episodic_memories[:5]
-        ])
-    else:
-        episodic_content = "None"
-    
-    # Build prompt for tool selection and argument extraction
-    guard_prompt = f"""You are enforcing the {procedure_name} procedure.
+
+def _static_guard_message(procedure_id: str, procedure) -> SystemMessage:
+    """Get or build the cacheable instruction message for a procedure."""
+    message = _static_guard_messages.get(procedure_id)
+    if message is None:
+        message = SystemMessage(
+            content=f"""You are enforcing the {procedure.get('name', 'Unknown Procedure')} procedure.
 
 PROCEDURE STEPS:
-{steps_text}
+{_STEPS_TEXT_CACHE[procedure_id]}
 
 ALLOWED TOOLS FOR THIS PROCEDURE:
-{json.dumps(allowed_tools, indent=2)}
+{dumps(procedure.get('allowed_tools', []), indent=True)}
 
 TOOL USAGE RULES:
-{tool_rules_text}
+{_TOOL_RULES_TEXT}
+
+{TOOL_EXTRACTION_BLOCK}""",
+            additional_kwargs={"cache_control": {"type": "ephemeral"}}
+        )
+        _static_guard_messages[procedure_id] = message
+    return message
+
+
+def _prepare(state):
+    """Resolve the procedure, its allowed tools, and the last user message."""
+    selected_procedure = state.get("selected_procedure", "standard_support")
+    if selected_procedure not in _PROCS:
+        selected_procedure = "standard_support"
+    procedure = _PROCS[selected_procedure]
+    allowed_tools = _ALLOWED_TOOLS_BY_PROC[selected_procedure]
+
+    user_text = ""
+    for message in reversed(state["messages"]):
+        if getattr(message, "type", "") == "human":
+            user_text = message.content
+            break
+
+    return selected_procedure, procedure, allowed_tools, user_text
 
-CONTEXT:
+
+def _guard_llm_messages(state, selected_procedure, procedure):
+    """Messages for the LLM fallback: static instructions first (cacheable
+    prefix), then conversation, then the per-turn memory context."""
+    context_prompt = f"""CONTEXT:
 - Semantic memories:
-{semantic_content}
+{format_memories(state.get("semantic_memories", []))}
 - Episodic memories:
-{episodic_content}
-
-TOOL SELECTION AND ARGUMENT EXTRACTION:
-
-1. For create_ticket (if in allowed_tools):
-   - REQUIRED: Extract customer_name from messages like "I'm X" or "Hi, I'm X"
-   - REQUIRED: Extract issue from the problem description
-   - OPTIONAL: Extract device if mentioned, otherwise use "-"
-   - OPTIONAL: priority (default: "Medium")
-   - Only use if NO tickets exist in memories or conversation history
-   - Example: {{"tool": "create_ticket", "arguments": {{"customer_name": "Cody", "issue": "slow internet speeds", "device": "-", "priority": "Medium"}}}}
-
-2. For update_ticket (if in allowed_tools):
-   - REQUIRED: Extract ticket_id from semantic memories (shown above) or conversation history
-   - Look for ticket_id in semantic memories - they may contain text like "ticket_id: 998880" or "Ticket 998880"
-   - OPTIONAL: Extract note from new information provided in the user's message
-   - OPTIONAL: Extract device if mentioned
-   - OPTIONAL: Extract status if mentioned
-   - Use when tickets exist in semantic memories AND user provides additional details
-   - Example: {{"tool": "update_ticket", "arguments": {{"ticket_id": "998880", "note": "Customer tried restarting modem"}}}}
-
-3. For lookup_ticket (if in allowed_tools):
-   - REQUIRED: Extract ticket_id from semantic memories or user message
-   - If user says "my ticket" and ticket exists in semantic memories, use that ticket_id
-   - Example: {{"tool": "lookup_ticket", "arguments": {{"ticket_id": "998880"}}}}
-
-ARGUMENT EXTRACTION RULES:
-- Look through ALL conversation messages and semantic memories (shown above) to find:
-  * customer_name: patterns like "I'm X", "Hi, I'm X", "My name is X"
-  * issue: the problem description
-  * device: device models mentioned
-  * ticket_id: CRITICAL - Extract from semantic memories. Look for patterns like "ticket_id: 123456", "Ticket 123456", or "ticket 123456" in the semantic memories shown above
-- IMPORTANT: If semantic memories contain a ticket_id and the user provides additional information (device details, troubleshooting steps, updates), you MUST use update_ticket with that ticket_id
-- Extract arguments from the latest user message and relevant conversation history
-- If ticket_id is missing for update_ticket, check semantic memories again - they should contain the ticket information
-
-Return ONLY JSON (no other text):
-{{
-  "tool": "create_ticket" | "update_ticket" | "lookup_ticket",
-  "arguments": {{
-    "customer_name": "...",  // for create_ticket
-    "issue": "...",          // for create_ticket
-    "device": "...",         // optional
-    "priority": "Medium",    // optional for create_ticket
-    "ticket_id": "...",      // for lookup_ticket/update_ticket
-    "note": "...",           // optional for update_ticket
-    "status": "..."          // optional for update_ticket
-  }}
-}}
-"""
-    
-    # Call LLM to select tool and extract arguments
-    messages = state["messages"] + [HumanMessage(content=guard_prompt)]
-    out = llm.invoke(messages)
-    content = extract_json_from_response(out.content)
-    
-    # Parse JSON
+{format_memories(state.get("episodic_memories", []))}
+
+Select the tool and extract arguments now. Return ONLY JSON."""
+
+    return [_static_guard_message(selected_procedure, procedure)] + state["messages"] + [HumanMessage(content=context_prompt)]
+
+
+def _parse_plan(content, allowed_tools):
+    """Parse the LLM's tool plan, validating against allowed_tools."""
     plan_tool = "lookup_ticket"
-    tool_arguments = {}
-    
+    tool_arguments = _EMPTY_ARGS
+
     try:
-        plan = json.loads(content)
+        plan = loads(content) if content else _EMPTY_ARGS
         selected_tool = plan.get("tool", "")
-        
+
         # Validate tool is in allowed_tools
         if selected_tool in allowed_tools:
             plan_tool = selected_tool
         elif allowed_tools:
             plan_tool = allowed_tools[0]  # Default to first allowed tool
-        
-        # Get arguments
-        tool_arguments = plan.get("arguments", {})
-        if tool_arguments is None:
-            tool_arguments = {}
-            
-    except (json.JSONDecodeError, Exception):
+
+        # Get arguments; fall back to the shared sentinel rather than
+        # allocating a fresh dict for every no-args plan
+        tool_arguments = plan.get("arguments") or _EMPTY_ARGS
+
+    except (ValueError, KeyError, TypeError, AttributeError):
         # Fallback: use first allowed tool
         if allowed_tools:
             plan_tool = allowed_tools[0]
-        tool_arguments = {}
-    
-    # Add procedural context for downstream nodes
-    procedural_prompt = f"""
-    You are following the {procedure_name} procedure.
+        tool_arguments = _EMPTY_ARGS
 
-    STEPS:
-    {steps_text}
+    return plan_tool, tool_arguments
 
-    TOOL USAGE RULES:
-    {tool_rules_text}
 
-    You MUST follow this procedure. Do not deviate.
-    """
-    
+def _guard_result(state, selected_procedure, allowed_tools, plan_tool, tool_arguments):
+    """Escalation check plus the state update shared by both node variants."""
+    # Add procedural context for downstream nodes
+    procedural_prompt = _PROCEDURAL_PROMPT_BY_PROC[selected_procedure]
+
     # Check for escalation (from previous tool execution)
     tool_result = state.get("tool_result")
     escalation_info = None
-    
+
     if tool_result and "ticket" in tool_result:
         ticket = tool_result.get("ticket", {})
         escalation_info = ProceduralMemory.get_escalation_decision(ticket)
         if escalation_info:
             # Auto-escalate to escalated_support procedure
-            escalated_procedure = ProceduralMemory.PROCEDURES["escalated_support"]
             return {
                 "selected_procedure": "escalated_support",
-                "allowed_tools": escalated_procedure.get("allowed_tools", []),
+                "allowed_tools": _ALLOWED_TOOLS_BY_PROC["escalated_support"],
                 "escalation_info": escalation_info,
                 "planner_action": "tool",
                 "planner_tool": plan_tool,
@@ -179,23 +162,23 @@ Return ONLY JSON (no other text):
                 "messages": [
                     SystemMessage(content=procedural_prompt),
                     SystemMessage(content=f"ESCALATION: {escalation_info['message']}"),
-                    AIMessage(content=json.dumps({"tool": plan_tool, "arguments": tool_arguments}))
+                    AIMessage(content=dumps({"tool": plan_tool, "arguments": tool_arguments}))
                 ]
             }
-    
+
     # Build final plan JSON
     final_plan = {
         "tool": plan_tool,
         "arguments": tool_arguments
     }
-    
+
     messages = [
         SystemMessage(content=procedural_prompt),
-        AIMessage(content=json.dumps(final_plan))
+        AIMessage(content=dumps(final_plan))
     ]
     if escalation_info:
         messages.append(SystemMessage(content=f"ESCALATION: {escalation_info['message']}"))
-    
+
     return {
         "messages": messages,
         "escalation_info": escalation_info,
@@ -204,3 +187,34 @@ Return ONLY JSON (no other text):
         "planner_arguments": tool_arguments,
         "allowed_tools": allowed_tools
     }
+
+
+def procedural_guard(state):
+    """Enforce procedure rules: select tool and extract arguments based on selected procedure."""
+    selected_procedure, procedure, allowed_tools, user_text = _prepare(state)
+
+    # Regex fast path: when the turn is unambiguous (clear ticket id plus
+    # update/status signals, or a clean introduction for create_ticket) the
+    # tool and arguments are decided without an LLM round-trip
+    fast_plan = fast_tool_plan(user_text, state.get("semantic_memories", []), allowed_tools)
+    if fast_plan is not None:
+        plan_tool, tool_arguments = fast_plan
+    else:
+        out = llm.invoke(_guard_llm_messages(state, selected_procedure, procedure))
+        plan_tool, tool_arguments = _parse_plan(extract_json_from_response(out.content), allowed_tools)
+
+    return _guard_result(state, selected_procedure, allowed_tools, plan_tool, tool_arguments)
+
+
+async def aprocedural_guard(state):
+    """Async variant of procedural_guard so the LLM fallback can overlap other I/O."""
+    selected_procedure, procedure, allowed_tools, user_text = _prepare(state)
+
+    fast_plan = fast_tool_plan(user_text, state.get("semantic_memories", []), allowed_tools)
+    if fast_plan is not None:
+        plan_tool, tool_arguments = fast_plan
+    else:
+        out = await llm.ainvoke(_guard_llm_messages(state, selected_procedure, procedure))
+        plan_tool, tool_arguments = _parse_plan(extract_json_from_response(out.content), allowed_tools)
+
+    return _guard_result(state, selected_procedure, allowed_tools, plan_tool, tool_arguments)
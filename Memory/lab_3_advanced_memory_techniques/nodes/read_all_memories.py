@@ -0,0 +1,32 @@
+"""Combined memory read node.
+
+Wiring preference_read, semantic_read, and episodic_read as separate graph
+nodes costs one backend round-trip each. This node issues the three reads
+concurrently and merges their state updates, so the read path pays only the
+slowest call. Use it in place of the three individual read nodes; each
+underlying module still needs its namespace/store globals set.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from .episodic_read import episodic_read
+from .preference_read import preference_read
+from .semantic_read import semantic_read
+
+_READS = (preference_read, semantic_read, episodic_read)
+
+
+def read_all_memories(state):
+    """Run all three memory reads concurrently and merge their updates."""
+    with ThreadPoolExecutor(max_workers=len(_READS)) as pool:
+        futures = [pool.submit(read, state) for read in _READS]
+        updates = [future.result() for future in futures]
+
+    # Merge in a fixed order so the memory messages stay deterministic
+    merged = {}
+    messages = []
+    for update in updates:
+        messages.extend(update.pop("messages", []))
+        merged.update(update)
+    if messages:
+        merged["messages"] = messages
+    return merged
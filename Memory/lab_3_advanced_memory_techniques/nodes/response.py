@@ -1,45 +1,17 @@
 """Response generation node."""
-import json
 from langchain_core.messages import SystemMessage, AIMessage
 
+from utils.fast_json import dumps
+
+from ._prompts import format_memories
+
 # LLM will be set in the main notebook
 llm = None
 
+# Substrings that mark an AIMessage as planner/guard JSON output
+_PLAN_JSON_KEYS = ('"action"', '"create_ticket"', '"lookup_ticket"', '"update_ticket"')
 
-def response_node(state):
-    """Generate response using all memories and tool results."""
-    msgs = state["messages"].copy()
-    
-    # Filter out planner's JSON output
-    filtered_msgs = []
-    for m in msgs:
-        if isinstance(m, AIMessage) and hasattr(m, 'content') and isinstance(m.content, str):
-            content = m.content.strip()
-            # Skip if it's just a JSON object (planner output)
-            if content.startswith('{') and content.endswith('}'):
-                try:
-                    parsed = json.loads(content)
-                    if "action" in parsed or "create_ticket" in parsed or "lookup_ticket" in parsed or "update_ticket" in parsed:
-                        continue  # Skip planner JSON
-                except:
-                    if '"create_ticket"' in content or '"lookup_ticket"' in content or '"update_ticket"' in content or '"action"' in content:
-                        continue  # Skip it
-        filtered_msgs.append(m)
-    msgs = filtered_msgs
-    
-    # Add tool result if present (if not already added by tool_node)
-    tool_result = state.get("tool_result")
-    tool_result_in_messages = any(
-        isinstance(m, SystemMessage) and "Tool" in m.content 
-        for m in msgs
-    )
-    
-    if tool_result and not tool_result_in_messages:
-        result_text = json.dumps(tool_result, indent=2)
-        msgs.append(SystemMessage(content=f"Tool execution result: {result_text}"))
-    
-    # Add system instruction (memories are already in messages from read nodes)
-    response_system = """You are a CRM support agent with multi-memory access.
+_RESPONSE_SYSTEM = """You are a CRM support agent with multi-memory access.
 
     RULES:
     - Use semantic memories for facts (ticket IDs, device models, speed plans)
@@ -51,10 +23,84 @@ def response_node(state):
     - If no ticket exists, clearly state that
 
     Keep responses helpful and concise. When a ticket is created, explicitly state the ticket number."""
-    
-    if not any(isinstance(m, SystemMessage) and "CRM support agent" in m.content for m in msgs):
-        msgs = [SystemMessage(content=response_system)] + msgs
-    
-    # Generate response
-    reply = llm.invoke(msgs)
+
+
+def _prepare_messages(state):
+    """Assemble the message list for the response LLM call."""
+    # Single pass over the history: filter planner JSON and record whether a
+    # system-rules message is already present, instead of one filter loop
+    # plus any() rescans. The planner check is a cheap substring test - no
+    # json.loads attempt (and exception) per AIMessage. Whether a tool-result
+    # message is already in the history is a state flag set by tool_node, so
+    # no per-message substring scan is needed for it. The flag only survives
+    # if the graph's AgentState declares the channel (LangGraph drops updates
+    # to undeclared keys), so an absent key falls back to scanning below.
+    filtered_msgs = []
+    tool_result_in_messages = state.get("tool_result_in_messages")
+    has_system_rules = False
+    for m in state["messages"]:
+        if isinstance(m, SystemMessage):
+            content = m.content
+            if "CRM support agent" in content:
+                has_system_rules = True
+        elif isinstance(m, AIMessage) and isinstance(m.content, str):
+            content = m.content.strip()
+            # Skip if it's just a JSON object (planner output)
+            if content.startswith('{') and content.endswith('}') and \
+                    any(key in content for key in _PLAN_JSON_KEYS):
+                continue
+        filtered_msgs.append(m)
+    msgs = filtered_msgs
+
+    # Render the current turn's memories as one block, appended last so the
+    # static history prefix stays cacheable. Read nodes no longer push
+    # per-memory SystemMessages into the history.
+    memory_parts = []
+    semantic_memories = state.get("semantic_memories")
+    if semantic_memories:
+        memory_parts.append("Semantic memories (facts, domain knowledge):\n" + format_memories(semantic_memories))
+    episodic_memories = state.get("episodic_memories")
+    if episodic_memories:
+        memory_parts.append("Episodic memories (past experiences):\n" + format_memories(episodic_memories))
+    preferences = state.get("preferences")
+    if preferences:
+        memory_parts.append("User preferences:\n" + "\n".join(
+            f"- {key}: {value_dict.get('value', 'N/A')}"
+            for key, value_dict in preferences.items()
+        ))
+    if memory_parts:
+        msgs.append(SystemMessage(content="\n\n".join(memory_parts)))
+
+    # Add tool result if present (if not already added by tool_node)
+    tool_result = state.get("tool_result")
+    if tool_result and not tool_result_in_messages:
+        if tool_result_in_messages is None:
+            # Flag never delivered: the state schema doesn't carry it, so
+            # fall back to the substring scan to avoid appending a duplicate
+            # tool-result message.
+            tool_result_in_messages = any(
+                isinstance(m, SystemMessage) and "Tool" in m.content
+                for m in state["messages"]
+            )
+        if not tool_result_in_messages:
+            result_text = dumps(tool_result, indent=True)
+            msgs.append(SystemMessage(content=f"Tool execution result: {result_text}"))
+
+    # Add system instruction (memories are already in messages from read nodes).
+    # Insert into the list we own rather than allocating yet another one.
+    if not has_system_rules:
+        msgs.insert(0, SystemMessage(content=_RESPONSE_SYSTEM))
+
+    return msgs
+
+
+def response_node(state):
+    """Generate response using all memories and tool results."""
+    reply = llm.invoke(_prepare_messages(state))
+    return {"messages": [reply]}
+
+
+async def aresponse_node(state):
+    """Async variant of response_node so the LLM call can overlap other I/O."""
+    reply = await llm.ainvoke(_prepare_messages(state))
     return {"messages": [reply]}
@@ -1,9 +1,10 @@
 """Salience-gated memory write node."""
-import json
 import uuid
 import re
+from concurrent.futures import ThreadPoolExecutor
 from langchain_core.messages import SystemMessage, HumanMessage
 from utils.extract_json import extract_json_from_response
+from utils.fast_json import loads
 
 # These will be set in the main notebook
 namespace = None
@@ -12,6 +13,37 @@ salience_scorer = None
 semantic_store = None
 episodic_store = None
 
+# Single alternation compiled once: one regex pass per fact decides the
+# deterministic key (ticket id, device model, or customer name) instead of
+# three separate re.search calls on a lowered copy of the string
+_KEY_RE = re.compile(
+    r'(?:ticket[:\s#]*(?P<ticket>\d+))'
+    r'|(?P<device>netgear|archer|nighthawk|router[-\s]*[a-z0-9]+)'
+    r'|(?:customer[:\s]+(?P<customer>[a-z]+))',
+    re.IGNORECASE)
+
+
+def _semantic_key(fact: str):
+    """Deterministic key for a fact, or None when no pattern matches.
+
+    One scan with priority ticket > device > customer, so e.g.
+    "Customer has active ticket 998880" keys on the ticket id even though
+    the customer pattern matches earlier in the string.
+    """
+    device = customer = None
+    for match in _KEY_RE.finditer(fact):
+        if match.group("ticket"):
+            return f"ticket_{match.group('ticket')}"
+        if device is None and match.group("device"):
+            device = match.group("device")
+        elif customer is None and match.group("customer"):
+            customer = match.group("customer")
+    if device:
+        return f"device_{device.lower().strip().replace(' ', '_')}"
+    if customer:
+        return f"customer_{customer.lower()}"
+    return None
+
 
 def salience_gated_memory_write(state):
     """Write to memory stores only if salience threshold met or explicit trigger."""
@@ -29,11 +61,11 @@ def salience_gated_memory_write(state):
         if "ticket" in tool_result and tool_result["ticket"].get("status") in ["Escalated", "Resolved"]:
             explicit_trigger = True
     
-    # Compute salience scores
-    scores = salience_scorer.compute_salience(conversation, tool_result)
-    
-    should_write = salience_scorer.should_write(scores, threshold=0.6, explicit_trigger=explicit_trigger)
-    
+    # Score and gate in one step; an explicit trigger always writes, so the
+    # scoring LLM call is skipped entirely (scores is None in that case)
+    scores, should_write = salience_scorer.score_if_needed(
+        conversation, tool_result, threshold=0.6, explicit_trigger=explicit_trigger)
+
     if not should_write:
         return {"salience_scores": scores, "memory_written": False}
     
@@ -60,53 +92,51 @@ def salience_gated_memory_write(state):
     
     content = extract_json_from_response(response.content)
     
+    semantic_count = 0
+    episodic_count = 0
     try:
-        memories = json.loads(content)
-        
-        # Write semantic memories with deterministic keys for overwrite support
-        semantic_count = 0
-        for i, fact in enumerate(memories.get("semantic", [])):
+        memories = loads(content)
+
+        # Collect semantic memories with deterministic keys for overwrite
+        # support. Extracting a key from the fact (e.g. ticket_id,
+        # device_model) enables overwrite/consolidation; the UUID fallback is
+        # only generated when no pattern matched.
+        semantic_items = []
+        for fact in memories.get("semantic", []):
             if len(fact.strip()) > 10:
-                # Extract deterministic key from fact (e.g., ticket_id, device_model)
-                # This enables overwrite/consolidation
-                key = None
-                fact_lower = fact.lower()
-                
-                # Try to extract ticket ID
-                ticket_match = re.search(r'ticket[:\s#]*(\d+)', fact_lower)
-                if ticket_match:
-                    key = f"ticket_{ticket_match.group(1)}"
-                # Try to extract device model
-                elif "router" in fact_lower or "device" in fact_lower:
-                    device_match = re.search(r'(netgear|archer|nighthawk|router[-\s]*[a-z0-9]+)', fact_lower)
-                    if device_match:
-                        key = f"device_{device_match.group(1).replace(' ', '_')}"
-                # Try to extract customer name
-                elif "customer" in fact_lower:
-                    name_match = re.search(r'customer[:\s]+([a-z]+)', fact_lower)
-                    if name_match:
-                        key = f"customer_{name_match.group(1)}"
-                
-                # Fallback to UUID if no deterministic key found
-                if not key:
-                    key = f"semantic_{uuid.uuid4().hex[:8]}"
-                
-                # Upsert (overwrites if key exists)
-                semantic_store.put(namespace, key, fact)
-                semantic_count += 1
-        
-        # Write episodic memories (keep UUID keys - these are experiences, not facts)
-        episodic_count = 0
-        for i, experience in enumerate(memories.get("episodic", [])):
-            if len(experience.strip()) > 10:
-                key = f"episodic_{uuid.uuid4().hex[:8]}"
-                salience = scores.get("importance", 0.5)
-                episodic_store.put(namespace, key, experience, salience_score=salience)
-                episodic_count += 1
-        
+                key = _semantic_key(fact) or f"semantic_{uuid.uuid4().hex[:8]}"
+                semantic_items.append((key, fact, None))
+
+        # Episodic memories keep UUID keys - these are experiences, not facts.
+        # Explicit triggers skip scoring, and a lifecycle event is maximally
+        # salient by definition.
+        salience = scores.get("importance", 0.5) if scores else 1.0
+        episodic_items = [
+            (f"episodic_{uuid.uuid4().hex[:8]}", experience, None, salience)
+            for experience in memories.get("episodic", [])
+            if len(experience.strip()) > 10
+        ]
+
+        # One batch upsert per store (a single embedding round-trip each
+        # instead of one per fact); when both stores have writes they run
+        # concurrently since each batch is network-bound
+        if semantic_items and episodic_items:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                semantic_future = pool.submit(semantic_store.put_many, namespace, semantic_items)
+                episodic_future = pool.submit(episodic_store.put_many, namespace, episodic_items)
+                semantic_future.result()
+                episodic_future.result()
+        elif semantic_items:
+            semantic_store.put_many(namespace, semantic_items)
+        elif episodic_items:
+            episodic_store.put_many(namespace, episodic_items)
+
+        semantic_count = len(semantic_items)
+        episodic_count = len(episodic_items)
+
     except Exception as e:
         pass
-    
+
     return {
         "salience_scores": scores,
         "memory_written": True,
@@ -1,25 +1,67 @@
 """Semantic memory read node."""
-from langchain_core.messages import SystemMessage
+import hashlib
+from collections import OrderedDict
 
 # These will be set in the main notebook
 namespace = None
 semantic_store = None
 
+# Repeated or near-identical turns ("any update?", "still broken") re-run the
+# same embedding + ANN lookup. A small LRU keyed on the normalized query and
+# the store's write version skips both on exact repeats; the version in the
+# key means any memory write invalidates stale entries.
+_SEARCH_CACHE: "OrderedDict[tuple, list]" = OrderedDict()
+_SEARCH_CACHE_MAX = 128
+
+
+def _cache_key(query: str) -> tuple:
+    digest = hashlib.blake2b(" ".join(query.lower().split()).encode(), digest_size=12).digest()
+    return (namespace, digest, getattr(semantic_store, "version", 0))
+
+
+def _cache_put(key: tuple, results: list):
+    _SEARCH_CACHE[key] = results
+    if len(_SEARCH_CACHE) > _SEARCH_CACHE_MAX:
+        _SEARCH_CACHE.popitem(last=False)
+
 
 def semantic_read(state):
     """Retrieve semantic memories (facts, domain knowledge)."""
     query = state["messages"][-1].content if state["messages"] else ""
-    
-    # Search semantic store
-    results = semantic_store.search(namespace, query, top_k=3)
-    
-    if not results:
-        return {"semantic_memories": []}
-    
-    memory_text = "Semantic memories (facts, domain knowledge):\n"
-    memory_text += "\n".join([f"- {r['content']}" for r in results])
-    
-    return {
-        "semantic_memories": results,
-        "messages": [SystemMessage(content=memory_text)]
-    }
+
+    key = _cache_key(query)
+    results = _SEARCH_CACHE.get(key)
+    if results is None:
+        # Search semantic store
+        results = semantic_store.search(namespace, query, top_k=3)
+        _cache_put(key, results)
+    else:
+        _SEARCH_CACHE.move_to_end(key)
+
+    return _to_update(results)
+
+
+async def asemantic_read(state):
+    """Async variant of semantic_read so the graph can overlap memory reads."""
+    query = state["messages"][-1].content if state["messages"] else ""
+
+    key = _cache_key(query)
+    results = _SEARCH_CACHE.get(key)
+    if results is None:
+        results = await semantic_store.asearch(namespace, query, top_k=3)
+        _cache_put(key, results)
+    else:
+        _SEARCH_CACHE.move_to_end(key)
+
+    return _to_update(results)
+
+
+def _to_update(results):
+    """Build the state update from search results.
+
+    Memories ride in state only - no SystemMessage is appended, so past
+    turns' memory blocks don't accumulate in (and get re-sent with) the
+    message history. Downstream nodes render the current memories into
+    their own prompts exactly once.
+    """
+    return {"semantic_memories": results or []}
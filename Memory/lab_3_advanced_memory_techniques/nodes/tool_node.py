@@ -1,7 +1,8 @@
 """Tool execution node."""
-import json
 from langchain_core.messages import SystemMessage
-from tools.tools import TOOLS
+from tools.tools import TOOLS, TOOL_NAMES
+from utils.extract_json import extract_json_from_response
+from utils.fast_json import dumps, loads
 
 
 def tool_node(state):
@@ -13,24 +14,15 @@ def tool_node(state):
     # Parse JSON
     plan = None
     try:
-        plan = json.loads(raw)
-    except:
-        # Try to extract JSON using brace matching
-        brace_count = 0
-        start_idx = raw.find('{')
-        if start_idx != -1:
-            for i in range(start_idx, len(raw)):
-                if raw[i] == '{':
-                    brace_count += 1
-                elif raw[i] == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        json_str = raw[start_idx:i+1]
-                        try:
-                            plan = json.loads(json_str)
-                            break
-                        except:
-                            break
+        plan = loads(raw)
+    except (ValueError, TypeError):
+        # Pull the embedded JSON out with the shared extractor (C scanner,
+        # no per-character brace loop) and retry. ValueError covers both
+        # orjson and stdlib decode errors.
+        try:
+            plan = loads(extract_json_from_response(raw))
+        except (ValueError, TypeError):
+            plan = None
     
     # Get tool name and arguments from state
     if plan:
@@ -41,30 +33,31 @@ def tool_node(state):
         tool_name = state.get("planner_tool")
         arguments = state.get("planner_arguments", {})
     
-    # Execute tool
+    # Execute tool (O(1) dict dispatch by name)
     if tool_name:
-        for t in TOOLS:
-            if t["name"] == tool_name:
-                try:
-                    result = t["func"](arguments)
-                    result_text = json.dumps(result, indent=2)
-                    return {
-                        "tool_result": result,
-                        "messages": [SystemMessage(content=f"Tool '{tool_name}' executed successfully. Result: {result_text}")]
-                    }
-                except Exception as e:
-                    import traceback
-                    error_result = {"error": str(e), "tool": tool_name, "arguments": arguments}
-                    return {
-                        "tool_result": error_result,
-                        "messages": [SystemMessage(content=f"Tool '{tool_name}' failed with error: {str(e)}")]
-                    }
-        
-        # Tool not found
-        return {
-            "tool_result": {"error": f"Tool '{tool_name}' not found in available tools"},
-            "messages": [SystemMessage(content=f"Tool '{tool_name}' not found. Available tools: {[t['name'] for t in TOOLS]}")]
-        }
+        func = TOOLS.get(tool_name)
+        if func is None:
+            return {
+                "tool_result": {"error": f"Tool '{tool_name}' not found in available tools"},
+                "tool_result_in_messages": True,
+                "messages": [SystemMessage(content=f"Tool '{tool_name}' not found. Available tools: {list(TOOL_NAMES)}")]
+            }
+        try:
+            result = func(arguments)
+            result_text = dumps(result, indent=True)
+            return {
+                "tool_result": result,
+                "tool_result_in_messages": True,
+                "messages": [SystemMessage(content=f"Tool '{tool_name}' executed successfully. Result: {result_text}")]
+            }
+        except Exception as e:
+            # repr(e) keeps the exception type alongside the message
+            error_result = {"error": repr(e), "tool": tool_name, "arguments": arguments}
+            return {
+                "tool_result": error_result,
+                "tool_result_in_messages": True,
+                "messages": [SystemMessage(content=f"Tool '{tool_name}' failed with error: {repr(e)}")]
+            }
     
     # No tool specified - should not happen, but handle gracefully
     return {"tool_result": None}
@@ -1,34 +1,141 @@
 """Ticket management tools."""
-import json
+import atexit
+import os
 from datetime import datetime, timezone
 from pathlib import Path
 
+from utils.fast_json import dumps, loads
+
+# Optional: stream single-ticket lookups instead of parsing the whole DB
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # Load ticket DB
 ticket_file = Path(__file__).parent.parent.parent / "data" / "tickets.json"
+# Write-ahead log: each create/update appends one JSON line here instead of
+# rewriting the whole DB; the consolidated tickets.json is written only at
+# checkpoints (every _WAL_CHECKPOINT_OPS ops, and at interpreter exit)
+wal_file = ticket_file.parent / "tickets.wal"
+_WAL_CHECKPOINT_OPS = 32
+_wal_ops = 0
+
+# Every tool call reloads the DB to pick up external edits, but re-parsing the
+# whole file each time is pure I/O + JSON cost. Cache the parsed dict and
+# reload only when the files change; the key covers both the checkpoint file's
+# mtime and the WAL length, and our own writes refresh the cache in place.
+# max_id tracks the highest numeric ticket id in the cached db so creates
+# allocate the next id with an increment instead of an O(n) rescan
+_cache = {"key": None, "db": {}, "max_id": 0}
+
+
+def _db_files_key():
+    """Cache key covering the checkpoint file and the WAL."""
+    try:
+        mtime = os.stat(ticket_file).st_mtime_ns
+    except OSError:
+        mtime = 0
+    try:
+        wal_size = os.stat(wal_file).st_size
+    except OSError:
+        wal_size = 0
+    return (mtime, wal_size)
+
+
+def _replay_wal(db):
+    """Apply any pending WAL entries on top of the checkpointed DB."""
+    try:
+        with open(wal_file, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = loads(line)
+                except ValueError:
+                    continue  # torn final line from a crash mid-append
+                db[entry["id"]] = entry["ticket"]
+    except FileNotFoundError:
+        pass
+    return db
+
 
 def _load_ticket_db():
-    """Load ticket database from file."""
+    """Load ticket database from file, reusing the cache when unchanged."""
+    key = _db_files_key()
+    if key == _cache["key"]:
+        return _cache["db"]
+
     try:
         with open(ticket_file, "r") as f:
-            return json.load(f)
+            db = loads(f.read())
     except FileNotFoundError:
+        db = {}
+    except ValueError:
         return {}
-    except json.JSONDecodeError:
-        return {}
+
+    db = _replay_wal(db)
+    _cache["key"] = key
+    _cache["db"] = db
+    _cache["max_id"] = max((int(k) for k in db if k.isdigit()), default=0)
+    return db
+
+
+def _wal_append(op, ticket_id, ticket):
+    """Log one ticket op; O(record) instead of rewriting the whole DB."""
+    ticket_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(wal_file, "a") as f:
+        f.write(dumps({"op": op, "id": ticket_id, "ticket": ticket}) + "\n")
+
+
+def _record_op(op, ticket_id, ticket, db):
+    """Append to the WAL and checkpoint the full DB every few ops."""
+    global _wal_ops
+    _wal_append(op, ticket_id, ticket)
+    _cache["db"] = db
+    _cache["key"] = _db_files_key()
+    _wal_ops += 1
+    if _wal_ops >= _WAL_CHECKPOINT_OPS:
+        _checkpoint()
+
+
+def _checkpoint():
+    """Fold pending WAL entries into tickets.json and truncate the log."""
+    global _wal_ops
+    if _wal_ops == 0:
+        return
+    _save_ticket_db(_cache["db"])
+    try:
+        os.remove(wal_file)
+    except OSError:
+        pass
+    _wal_ops = 0
+    _cache["key"] = _db_files_key()
+
+
+atexit.register(_checkpoint)
 
 def _save_ticket_db(db):
-    """Save ticket database to file."""
+    """Save ticket database to file atomically."""
     try:
         # Ensure parent directory exists
         ticket_file.parent.mkdir(parents=True, exist_ok=True)
-        # Write to file
-        with open(ticket_file, "w") as f:
-            json.dump(db, f, indent=2)
-        # Verify write by reading back
-        with open(ticket_file, "r") as f:
-            verify_db = json.load(f)
-            if len(verify_db) != len(db):
-                raise Exception(f"Write verification failed: expected {len(db)} tickets, got {len(verify_db)}")
+        # Serialize once, write to a temp file, fsync, then atomically rename
+        # over the real file. Either the old or the new DB is on disk at any
+        # point, so no verify-by-reparse read-back is needed.
+        # Binary mode: explicit utf-8 bytes, no platform-dependent encoding
+        # or newline translation between the dump and what lands on disk
+        payload = dumps(db, indent=True).encode("utf-8")
+        tmp_file = ticket_file.with_suffix(".json.tmp")
+        with tmp_file.open("wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, ticket_file)
+        # Our own write: refresh the cache so the next read skips the parse
+        _cache["db"] = db
+        _cache["key"] = _db_files_key()
     except Exception as e:
         raise Exception(f"Failed to save ticket database: {str(e)}")
 
@@ -36,12 +143,62 @@ def _save_ticket_db(db):
 ticket_db = _load_ticket_db()
 
 
+def _wal_lookup(ticket_id):
+    """Latest pending WAL entry for one ticket, or None."""
+    ticket = None
+    try:
+        with open(wal_file, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = loads(line)
+                except ValueError:
+                    continue
+                if entry["id"] == ticket_id:
+                    ticket = entry["ticket"]
+    except FileNotFoundError:
+        pass
+    return ticket
+
+
+def _stream_lookup(ticket_id):
+    """Stream-parse tickets.json for one key without materializing the DB.
+
+    Only used when ijson is installed and the in-memory cache is stale;
+    memory stays O(one ticket) instead of O(DB).
+    """
+    ticket = None
+    try:
+        with open(ticket_file, "rb") as f:
+            for key, value in ijson.kvitems(f, ""):
+                if key == ticket_id:
+                    ticket = value
+                    break
+    except FileNotFoundError:
+        pass
+    except ijson.JSONError:
+        # Malformed checkpoint; the full-load path handles this case
+        return _load_ticket_db().get(ticket_id)
+
+    # Pending WAL entries are newer than the checkpoint file
+    wal_ticket = _wal_lookup(ticket_id)
+    return wal_ticket if wal_ticket is not None else ticket
+
+
 def lookup_ticket_tool(ticket_id: str):
     """Lookup ticket by ID."""
     global ticket_db
-    # Reload from file to ensure we have latest data
-    ticket_db = _load_ticket_db()
-    ticket = ticket_db.get(ticket_id)
+    # Cached DB is current: plain dict lookup. Stale with ijson available:
+    # stream just the one ticket. Otherwise: full reload as before.
+    if _db_files_key() == _cache["key"]:
+        ticket = _cache["db"].get(ticket_id)
+    elif ijson is not None:
+        ticket = _stream_lookup(ticket_id)
+    else:
+        ticket_db = _load_ticket_db()
+        ticket = ticket_db.get(ticket_id)
     if ticket is None:
         return {"error": f"Ticket {ticket_id} not found."}
     return {"ticket": ticket, "ticket_id": ticket_id}
@@ -53,32 +210,33 @@ def create_ticket_tool(customer_name: str, issue: str, device: str = "-", priori
     # Reload to ensure we have latest data before creating
     ticket_db = _load_ticket_db()
     
-    # Generate new ticket ID
-    existing_ids = [int(k) for k in ticket_db.keys() if k.isdigit()]
-    new_id = str(max(existing_ids, default=0) + 1)
+    # Generate new ticket ID: O(1) increment off the cached max, falling back
+    # to a scan only when the db in hand is not the cached one
+    if ticket_db is _cache["db"]:
+        max_id = _cache["max_id"]
+    else:
+        max_id = max((int(k) for k in ticket_db if k.isdigit()), default=0)
+    new_id = str(max_id + 1)
+    _cache["max_id"] = max_id + 1
     
-    # Create ticket
+    # Create ticket (one clock read and one strftime, reused below)
+    now = datetime.now(timezone.utc)
+    today = now.strftime("%Y-%m-%d")
     ticket_db[new_id] = {
         "status": "New",
         "issue": issue,
         "description": issue,
         "device": device,
         "priority": priority,
-        "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
-        "last_updated": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+        "created_at": today,
+        "last_updated": today,
         "customer_name": customer_name,
-        "notes": [{"timestamp": datetime.now(timezone.utc).isoformat(), "author": "customer", "text": issue}]
+        "notes": [{"timestamp": now.isoformat(), "author": "customer", "text": issue}]
     }
     
-    # Save to file with verification
+    # Log the new ticket; the full DB is rewritten only at checkpoints
     try:
-        _save_ticket_db(ticket_db)
-        # Verify the ticket was saved by reloading
-        verify_db = _load_ticket_db()
-        if new_id not in verify_db:
-            raise Exception(f"Ticket {new_id} was not found after save. File path: {ticket_file.resolve()}")
-        # Update global ticket_db to match saved state
-        ticket_db = verify_db
+        _record_op("create", new_id, ticket_db[new_id], ticket_db)
     except Exception as e:
         error_msg = f"Failed to save ticket: {str(e)}"
         return {"error": error_msg, "ticket_id": new_id, "ticket": ticket_db.get(new_id), "file_path": str(ticket_file.resolve())}
@@ -98,33 +256,38 @@ def update_ticket_tool(ticket_id: str, note: str = None, device: str = None, sta
         return {"error": f"Ticket {ticket_id} not found."}
     
     ticket = ticket_db[ticket_id]
-    
+    now = datetime.now(timezone.utc)
+
     # Update fields
     if note:
         if "notes" not in ticket:
             ticket["notes"] = []
         ticket["notes"].append({
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": now.isoformat(),
             "author": "customer",
             "text": note
         })
-    
+
     if device and device != "-":
         ticket["device"] = device
-    
+
     if status:
         ticket["status"] = status
-    
-    ticket["last_updated"] = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    
-    # Save to file
-    _save_ticket_db(ticket_db)
-    
+
+    ticket["last_updated"] = now.strftime("%Y-%m-%d")
+
+    # Log the update; the full DB is rewritten only at checkpoints
+    _record_op("update", ticket_id, ticket, ticket_db)
+
     return {"ticket_id": ticket_id, "status": "updated", "ticket": ticket}
 
 
-TOOLS = [
-    {"name": "lookup_ticket", "func": lambda args: lookup_ticket_tool(args["ticket_id"])},
-    {"name": "create_ticket", "func": lambda args: create_ticket_tool(**args)},
-    {"name": "update_ticket", "func": lambda args: update_ticket_tool(**args)}
-]
+# Keyed by name for O(1) dispatch; each value takes the raw arguments dict
+TOOLS = {
+    "lookup_ticket": lambda args: lookup_ticket_tool(args["ticket_id"]),
+    "create_ticket": lambda args: create_ticket_tool(**args),
+    "update_ticket": lambda args: update_ticket_tool(**args)
+}
+
+# Stable tuple for error messages, built once
+TOOL_NAMES = tuple(TOOLS)
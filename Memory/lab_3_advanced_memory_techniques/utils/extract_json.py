@@ -2,11 +2,26 @@
 import re
 import json
 
+# Compiled once; this runs on every LLM reply
+_CODE_BLOCK_RE = re.compile(r'```(?:json)?', re.IGNORECASE)
+
+# raw_decode scans with the C _json module, so no per-character Python loop
+_DECODER = json.JSONDecoder()
+
 
 def extract_json_from_response(content: str) -> str:
     """Extract JSON from LLM response, handling markdown code blocks and nested objects."""
+    if not content:
+        return ""
+
+    # Fast path: models asked for JSON almost always reply with a bare
+    # object/array, so skip the code-block scan entirely
+    stripped = content.strip()
+    if stripped.startswith(('{', '[')) and stripped.endswith(('}', ']')):
+        return stripped
+
     # Try to extract JSON from markdown code blocks first
-    code_block_match = re.search(r'```(?:json)?', content, re.IGNORECASE)
+    code_block_match = _CODE_BLOCK_RE.search(content)
     if code_block_match:
         # Find the start of JSON after ```
         json_start = content.find('{', code_block_match.end())
@@ -33,35 +48,21 @@ def extract_json_from_response(content: str) -> str:
 
 
 def _extract_complete_json(content: str, start_idx: int) -> str:
-    """Extract complete JSON object/array using brace/bracket counting."""
-    brace_count = 0
-    bracket_count = 0
-    in_string = False
-    escape_next = False
-    
-    for i in range(start_idx, len(content)):
-        char = content[i]
-        if escape_next:
-            escape_next = False
-            continue
-        if char == '\\':
-            escape_next = True
-            continue
-        if char == '"' and not escape_next:
-            in_string = not in_string
-            continue
-        if not in_string:
-            if char == '{':
-                brace_count += 1
-            elif char == '}':
-                brace_count -= 1
-                if brace_count == 0 and bracket_count == 0:
-                    return content[start_idx:i+1]
-            elif char == '[':
-                bracket_count += 1
-            elif char == ']':
-                bracket_count -= 1
-                if brace_count == 0 and bracket_count == 0:
-                    return content[start_idx:i+1]
-    
+    """Extract the first complete JSON object/array at or after start_idx.
+
+    raw_decode does the scanning in C instead of a Python per-character
+    brace-counting loop; on a false start (e.g. a literal brace in prose)
+    it retries from the next candidate.
+    """
+    idx = start_idx
+    while idx != -1:
+        try:
+            _, end = _DECODER.raw_decode(content, idx)
+            return content[idx:end]
+        except json.JSONDecodeError:
+            next_obj = content.find('{', idx + 1)
+            next_arr = content.find('[', idx + 1)
+            candidates = [c for c in (next_obj, next_arr) if c != -1]
+            idx = min(candidates) if candidates else -1
+
     return None
@@ -0,0 +1,23 @@
+"""JSON helpers backed by orjson when it is installed.
+
+orjson encodes ~3-10x and decodes ~2-3x faster than the stdlib. The stdlib
+fallback keeps behavior identical when orjson is not available.
+"""
+
+try:
+    import orjson
+
+    def dumps(obj, indent: bool = False) -> str:
+        """Serialize obj to a JSON string (indent=True for 2-space pretty print)."""
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option).decode()
+
+    loads = orjson.loads
+except ImportError:
+    import json
+
+    def dumps(obj, indent: bool = False) -> str:
+        """Serialize obj to a JSON string (indent=True for 2-space pretty print)."""
+        return json.dumps(obj, indent=2 if indent else None)
+
+    loads = json.loads
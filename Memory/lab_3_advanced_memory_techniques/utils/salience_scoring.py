@@ -1,6 +1,8 @@
 """Salience scoring for memory writes."""
+import hashlib
 import json
-from typing import Dict, Optional
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 from langchain_core.messages import HumanMessage
 from langchain_openai import ChatOpenAI
 from utils.extract_json import extract_json_from_response
@@ -8,12 +10,44 @@ from utils.extract_json import extract_json_from_response
 
 class SalienceScorer:
     """Compute importance, novelty, contradiction, and risk scores for memory writes."""
-    
+
+    _CACHE_MAX = 512
+
     def __init__(self, llm: ChatOpenAI):
         self.llm = llm
-    
+        # Scoring is a pure function of (conversation, tool_result), and
+        # near-duplicate turns recur, so memoize the parsed scores behind a
+        # bounded LRU. Hits skip both the LLM call and the JSON parse.
+        self._cache: "OrderedDict[bytes, Dict[str, float]]" = OrderedDict()
+
+    @staticmethod
+    def _cache_key(conversation: str, tool_result: Optional[Dict]) -> bytes:
+        digest = hashlib.blake2b(conversation.encode(), digest_size=16)
+        if tool_result:
+            digest.update(json.dumps(tool_result, sort_keys=True, default=str).encode())
+        return digest.digest()
+
     def compute_salience(self, conversation: str, tool_result: Optional[Dict] = None) -> Dict[str, float]:
         """Compute salience scores for the conversation."""
+        key = self._cache_key(conversation, tool_result)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        scores = self._score_with_llm(conversation, tool_result)
+        if scores is None:
+            # Parse failure: return the neutral fallback without caching it,
+            # so a transient formatting flake is rescored on the next
+            # identical turn instead of being memoized.
+            return {"importance": 0.5, "novelty": 0.5, "contradiction": 0.0, "risk": 0.0}
+        self._cache[key] = scores
+        if len(self._cache) > self._CACHE_MAX:
+            self._cache.popitem(last=False)
+        return scores
+
+    def _score_with_llm(self, conversation: str, tool_result: Optional[Dict] = None) -> Optional[Dict[str, float]]:
+        """Run the scoring LLM call and parse the result; None if unparseable."""
         # Format tool_result outside the prompt
         tool_result_text = json.dumps(tool_result, indent=2) if tool_result else 'None'
         
@@ -45,9 +79,27 @@ class SalienceScorer:
                 "contradiction": float(scores.get("contradiction", 0.0)),
                 "risk": float(scores.get("risk", 0.0))
             }
-        except:
-            return {"importance": 0.5, "novelty": 0.5, "contradiction": 0.0, "risk": 0.0}
+        except (ValueError, TypeError, AttributeError):
+            # ValueError: malformed JSON or non-numeric score; TypeError /
+            # AttributeError: reply parsed to something that is not a dict
+            # of numbers. Anything else (KeyboardInterrupt, MemoryError)
+            # should propagate.
+            return None
     
+    def score_if_needed(self, conversation: str, tool_result: Optional[Dict] = None,
+                        threshold: float = 0.6, explicit_trigger: bool = False) -> Tuple[Optional[Dict[str, float]], bool]:
+        """Combined score-and-gate that skips the LLM when the outcome is fixed.
+
+        An explicit trigger always writes, so scoring first and then checking
+        the trigger wastes an LLM round trip. Returns (scores, should_write);
+        scores is None on the trigger short-circuit.
+        """
+        if explicit_trigger:
+            return None, True
+
+        scores = self.compute_salience(conversation, tool_result)
+        return scores, self.should_write(scores, threshold=threshold)
+
     def should_write(self, scores: Dict[str, float], threshold: float = 0.6, explicit_trigger: bool = False) -> bool:
         """Determine if memory should be written."""
         if explicit_trigger:
@@ -4,15 +4,17 @@ A multi-agent system that routes customer queries to specialized agents
 based on intent classification.
 """
 
+import asyncio
+
 from langchain_core.runnables import RunnableParallel, RunnableLambda
 from langgraph.graph import StateGraph, END
 from state import AgentState
-from nodes.intent_agent import intent_agent
-from nodes.entity_agent import entity_agent
+from nodes.intent_agent import intent_agent, aintent_agent
+from nodes.entity_agent import entity_agent, aentity_agent
 from nodes.product_node import product_info_agent, user_history_agent
-from nodes.troubleshoot_agent import troubleshoot_agent
-from nodes.composer_agent import reply_agent
-from nodes.refund_agent import refund_agent
+from nodes.troubleshoot_agent import troubleshoot_agent, atroubleshoot_agent
+from nodes.composer_agent import reply_agent, areply_agent
+from nodes.refund_agent import refund_agent, arefund_agent
 
 
 # Create RunnableParallel for true parallel execution
@@ -21,44 +23,77 @@ parallel_node = RunnableParallel({
     "user_history": RunnableLambda(user_history_agent)
 })
 
+# Intent classification and entity extraction are independent functions of the
+# query, so run both LLM calls in parallel and pay only one round trip before
+# routing. The updates are flattened so the router still sees a plain string
+# under "intent".
+_classify_parallel = RunnableParallel({
+    "intent": RunnableLambda(intent_agent),
+    "entities": RunnableLambda(entity_agent)
+})
+
+
+def classify_node(state: AgentState) -> dict:
+    """Run intent and entity agents concurrently and merge their updates."""
+    results = _classify_parallel.invoke(state)
+    return {**results["intent"], **results["entities"]}
+
+
+async def aclassify_node(state: AgentState) -> dict:
+    """Async classify: both LLM calls overlap on the event loop, no threads."""
+    intent_update, entities_update = await asyncio.gather(
+        aintent_agent(state), aentity_agent(state))
+    return {**intent_update, **entities_update}
+
+
+def _build_graph(classify, troubleshoot, refund, reply) -> StateGraph:
+    """Wire the support pipeline; sync and async variants share the topology."""
+    graph = StateGraph(AgentState)
+
+    # Add nodes
+    graph.add_node("classify", classify)
+    graph.add_node("parallel", parallel_node)
+    graph.add_node("troubleshoot", troubleshoot)
+    graph.add_node("refund", refund)
+    graph.add_node("reply", reply)
+
+    # Set entry point
+    graph.set_entry_point("classify")
+
+    # Define routing logic (entities are already extracted, so product and
+    # order intents go straight to the parallel data-fetch node)
+    graph.add_conditional_edges(
+        "classify",
+        lambda s: s.intent or "unknown",
+        {
+            "unknown": "reply",
+            "product_info": "parallel",
+            "order_status": "parallel",
+            "refund_request": "refund",
+            "tech_support": "troubleshoot",
+        }
+    )
+
+    # Define edges
+    graph.add_edge("parallel", "reply")
+    graph.add_edge("troubleshoot", "reply")
+    graph.add_edge("refund", "reply")
+    graph.add_edge("reply", END)
+
+    return graph
+
 
 # Build the graph
-graph = StateGraph(AgentState)
-
-# Add nodes
-graph.add_node("intent", intent_agent)
-graph.add_node("entities", entity_agent)
-graph.add_node("parallel", parallel_node)
-graph.add_node("troubleshoot", troubleshoot_agent)
-graph.add_node("refund", refund_agent)
-graph.add_node("reply", reply_agent)
-
-# Set entry point
-graph.set_entry_point("intent")
-
-# Define routing logic
-graph.add_conditional_edges(
-    "intent",
-    lambda s: s.get("intent", "unknown"),
-    {
-        "unknown": "reply",
-        "product_info": "entities",
-        "order_status": "entities",
-        "refund_request": "refund",
-        "tech_support": "troubleshoot",
-    }
-)
-
-# Define edges
-graph.add_edge("entities", "parallel")
-graph.add_edge("parallel", "reply")
-graph.add_edge("troubleshoot", "reply")
-graph.add_edge("refund", "reply")
-graph.add_edge("reply", END)
+graph = _build_graph(classify_node, troubleshoot_agent, refund_agent, reply_agent)
 
 # Compile the graph
 runnable = graph.compile()
 
+# Async pipeline: same topology over the ainvoke-based node variants, so a
+# caller driving it with `await arunnable.ainvoke(...)` overlaps the LLM
+# round trips on the event loop instead of blocking threads
+arunnable = _build_graph(aclassify_node, atroubleshoot_agent, arefund_agent, areply_agent).compile()
+
 # Generate and save graph diagram
 runnable.get_graph().draw_mermaid_png(output_file_path="graph.png")
 
@@ -7,9 +7,12 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import json
+from langchain_core.messages import HumanMessage
 from langchain_core.prompts import ChatPromptTemplate
 from llm import llm_gpt
 from state import AgentState
+from utils.llm_cache import acached_invoke, cached_invoke
 
 reply_prompt = ChatPromptTemplate.from_template("""
 You are a helpful customer support agent. Generate a clear, helpful response.
@@ -49,27 +52,60 @@ Rules by intent:
   • Do not ask generic questions like "How can I help?"
 """)
 
+# The raw template string, extracted once: seven holes make prefix/suffix
+# splitting unwieldy, but one str.format on the plain string still skips
+# LangChain's per-call template machinery
+_REPLY_TEMPLATE = reply_prompt.messages[0].prompt.template
+
+
+def _compose_reply(context: dict) -> str:
+    """Run the reply LLM call and strip the result."""
+    result = llm_gpt.invoke([HumanMessage(content=_REPLY_TEMPLATE.format(**context))])
+    return result.content.strip()
+
+
+def _reply_context(state: AgentState) -> dict:
+    """Collect the prompt context for the reply call."""
+    return {
+        "query": state.query,
+        "intent": state.intent or "unknown",
+        "entities": state.entities,
+        "product_info": state.product_info,
+        "user_history": state.user_history,
+        "errors": state.errors,
+        "refund": state.refund,
+    }
+
 
 def reply_agent(state: AgentState) -> dict:
     """Generate final reply to user.
-    
+
     Args:
         state: Current agent state with all collected information
-        
+
     Returns:
         Dictionary with 'reply' key containing the final response
     """
-    result = llm_gpt.invoke(reply_prompt.format_messages(
-        query=state.get("query", ""),
-        intent=state.get("intent", "unknown"),
-        entities=state.get("entities", {}),
-        product_info=state.get("product_info"),
-        user_history=state.get("user_history"),
-        errors=state.get("errors", []),
-        refund=state.get("refund"),
-    ))
-    
-    reply = result.content.strip()
+    context = _reply_context(state)
+
+    # The reply depends on everything in the prompt, so hash all of it
+    key_parts = (json.dumps(context, sort_keys=True, default=str),)
+    reply = cached_invoke("reply", key_parts, lambda: _compose_reply(context))
+    return {"reply": reply}
+
+
+async def _acompose_reply(context: dict) -> str:
+    """Async variant of _compose_reply."""
+    result = await llm_gpt.ainvoke([HumanMessage(content=_REPLY_TEMPLATE.format(**context))])
+    return result.content.strip()
+
+
+async def areply_agent(state: AgentState) -> dict:
+    """Async variant of reply_agent so the LLM call can overlap other I/O."""
+    context = _reply_context(state)
+
+    key_parts = (json.dumps(context, sort_keys=True, default=str),)
+    reply = await acached_invoke("reply", key_parts, lambda: _acompose_reply(context))
     return {"reply": reply}
 
 
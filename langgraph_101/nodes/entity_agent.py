@@ -9,9 +9,21 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import json
 import re
+from langchain_core.messages import HumanMessage
 from langchain_core.prompts import ChatPromptTemplate
 from llm import llm_gpt
 from state import AgentState
+from utils.llm_cache import acached_invoke, cached_invoke
+
+# Compiled once at import; this runs on every entity reply that is not bare JSON
+_ENTITY_RE = re.compile(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}')
+
+# Optional: msgspec decodes and type-checks the entity dict in one C pass
+try:
+    import msgspec
+    _ENTITIES_DECODER = msgspec.json.Decoder(dict)
+except ImportError:
+    msgspec = None
 
 entity_prompt = ChatPromptTemplate.from_template("""
 Extract structured information from the user query.
@@ -24,25 +36,27 @@ If no entities are found, return {{}}.
 Query: {query}
 """)
 
+# Rendered once at import (which also unescapes the literal {{ }} braces);
+# per call the prompt is one string concat
+_SENTINEL = "\x00QUERY\x00"
+_PREFIX, _SUFFIX = entity_prompt.messages[0].prompt.format(query=_SENTINEL).split(_SENTINEL)
+
+
+def _parse_entities(content: str) -> dict:
+    """Parse the entity reply into a dict (shared by sync and async paths)."""
+    # Fast path: typed C decode of a bare JSON object
+    if msgspec is not None:
+        try:
+            return _ENTITIES_DECODER.decode(content)
+        except msgspec.DecodeError:
+            pass  # embedded or malformed JSON: fall through to the regex path
 
-def entity_agent(state: AgentState) -> dict:
-    """Extract entities from user query.
-    
-    Args:
-        state: Current agent state containing the user query
-        
-    Returns:
-        Dictionary with 'entities' key containing extracted entities
-    """
-    result = llm_gpt.invoke(entity_prompt.format_messages(query=state["query"]))
-    content = result.content.strip()
-    
     # Try to parse JSON directly
     try:
         entities = json.loads(content)
     except json.JSONDecodeError:
         # Extract JSON from text if embedded
-        json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', content)
+        json_match = _ENTITY_RE.search(content)
         if json_match:
             try:
                 entities = json.loads(json_match.group())
@@ -50,9 +64,42 @@ def entity_agent(state: AgentState) -> dict:
                 entities = {}
         else:
             entities = {}
-    
+
     # Ensure entities is a dict
     if not isinstance(entities, dict):
         entities = {}
-    
+
+    return entities
+
+
+def _extract_entities(query: str) -> dict:
+    """Run the entity LLM call and parse the result into a dict."""
+    result = llm_gpt.invoke([HumanMessage(content=_PREFIX + query + _SUFFIX)])
+    return _parse_entities(result.content.strip())
+
+
+def entity_agent(state: AgentState) -> dict:
+    """Extract entities from user query.
+
+    Args:
+        state: Current agent state containing the user query
+
+    Returns:
+        Dictionary with 'entities' key containing extracted entities
+    """
+    query = state.query
+    entities = cached_invoke("entities", (query,), lambda: _extract_entities(query))
+    return {"entities": entities}
+
+
+async def _aextract_entities(query: str) -> dict:
+    """Async variant of _extract_entities."""
+    result = await llm_gpt.ainvoke([HumanMessage(content=_PREFIX + query + _SUFFIX)])
+    return _parse_entities(result.content.strip())
+
+
+async def aentity_agent(state: AgentState) -> dict:
+    """Async variant of entity_agent so the LLM call can overlap other I/O."""
+    query = state.query
+    entities = await acached_invoke("entities", (query,), lambda: _aextract_entities(query))
     return {"entities": entities}
\ No newline at end of file
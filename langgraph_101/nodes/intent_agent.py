@@ -8,9 +8,23 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import re
+from langchain_core.messages import HumanMessage
 from langchain_core.prompts import ChatPromptTemplate
 from llm import llm_gpt
 from state import AgentState
+from utils.llm_cache import acached_invoke, cached_invoke
+
+# High-precision keyword patterns tried before the LLM, in priority order:
+# a match decides the intent without an LLM round trip; only ambiguous
+# queries fall through. Refund outranks product_info so "refund for my
+# broken Kindle, still under warranty" doesn't key on "warranty".
+_KW = (
+    ("refund_request", re.compile(r"\brefund\b|\bmoney back\b", re.IGNORECASE)),
+    ("order_status", re.compile(r"\border\s*#?\s*\d+|\bwhere is\b", re.IGNORECASE)),
+    ("tech_support", re.compile(r"\bnot (?:turning on|working|charging)\b|\bbroken\b", re.IGNORECASE)),
+    ("product_info", re.compile(r"\b(?:battery|warranty|price|stock)\b", re.IGNORECASE)),
+)
 
 intent_prompt = ChatPromptTemplate.from_template("""
 Classify the user's intent into one of these categories:
@@ -25,16 +39,53 @@ Return ONLY the intent value, nothing else.
 Query: {query}
 """)
 
+# Render the template once at import and keep the text around the {query}
+# hole, so the hot path is one string concat instead of LangChain's
+# formatter machinery per call
+_SENTINEL = "\x00QUERY\x00"
+_PREFIX, _SUFFIX = intent_prompt.messages[0].prompt.format(query=_SENTINEL).split(_SENTINEL)
+
+
+def _keyword_intent(query: str):
+    """Classify by keyword when a high-precision pattern matches, else None."""
+    for intent, pattern in _KW:
+        if pattern.search(query):
+            return intent
+    return None
+
+
+def _classify_intent(query: str) -> str:
+    """Run the intent LLM call and parse the result."""
+    result = llm_gpt.invoke([HumanMessage(content=_PREFIX + query + _SUFFIX)])
+    return result.content.strip().lower()
+
 
 def intent_agent(state: AgentState) -> dict:
     """Classify user query intent.
-    
+
     Args:
         state: Current agent state containing the user query
-        
+
     Returns:
         Dictionary with 'intent' key containing the classified intent
     """
-    result = llm_gpt.invoke(intent_prompt.format_messages(query=state["query"]))
-    intent = result.content.strip().lower()  
+    query = state.query
+    intent = _keyword_intent(query)
+    if intent is None:
+        intent = cached_invoke("intent", (query,), lambda: _classify_intent(query))
+    return {"intent": intent}
+
+
+async def _aclassify_intent(query: str) -> str:
+    """Async variant of _classify_intent."""
+    result = await llm_gpt.ainvoke([HumanMessage(content=_PREFIX + query + _SUFFIX)])
+    return result.content.strip().lower()
+
+
+async def aintent_agent(state: AgentState) -> dict:
+    """Async variant of intent_agent so the LLM call can overlap other I/O."""
+    query = state.query
+    intent = _keyword_intent(query)
+    if intent is None:
+        intent = await acached_invoke("intent", (query,), lambda: _aclassify_intent(query))
     return {"intent": intent}
\ No newline at end of file
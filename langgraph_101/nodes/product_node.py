@@ -33,7 +33,7 @@ def product_info_agent(state: AgentState) -> dict:
     Returns:
         Dictionary with 'product_info' key
     """
-    entities = state.get("entities", {})
+    entities = state.entities
     if not isinstance(entities, dict):
         entities = {}
     
@@ -11,6 +11,22 @@ import json
 from langchain_core.prompts import ChatPromptTemplate
 from llm import llm_gpt
 from state import AgentState
+from utils.llm_cache import acached_invoke, cached_invoke
+
+# Optional: msgspec decodes and validates the refund schema in one C pass,
+# replacing json.loads plus the isinstance check
+try:
+    import msgspec
+
+    class RefundResult(msgspec.Struct):
+        refund_intent: bool
+        eligible: bool
+        reason: str
+        next_step: str
+
+    _REFUND_DECODER = msgspec.json.Decoder(RefundResult)
+except ImportError:
+    msgspec = None
 
 refund_prompt = ChatPromptTemplate.from_template("""
 You are a refund analysis agent.
@@ -39,24 +55,16 @@ Product info: {product_info}
 """)
 
 
-def refund_agent(state: AgentState) -> dict:
-    """Analyze refund request and determine eligibility.
-    
-    Args:
-        state: Current agent state containing query and product_info
-        
-    Returns:
-        Dictionary with 'refund' key containing refund analysis
-    """
-    product_info = state.get("product_info")
-    
-    result = llm_gpt.invoke(refund_prompt.format_messages(
-        query=state["query"],
-        product_info=product_info if product_info else "No product information available"
-    ))
+def _parse_refund(content: str) -> dict:
+    """Parse the refund analysis reply (shared by sync and async paths)."""
+    if msgspec is not None:
+        try:
+            return msgspec.structs.asdict(_REFUND_DECODER.decode(content))
+        except msgspec.DecodeError:
+            pass  # fall through to the stdlib path and its fallback dict
 
     try:
-        refund_data = json.loads(result.content.strip())
+        refund_data = json.loads(content)
         if not isinstance(refund_data, dict):
             raise ValueError("Invalid refund data format")
     except (json.JSONDecodeError, ValueError):
@@ -67,4 +75,50 @@ def refund_agent(state: AgentState) -> dict:
             "next_step": "Please provide more details about your refund request"
         }
 
+    return refund_data
+
+
+def _analyze_refund(query: str, product_info) -> dict:
+    """Run the refund LLM call and parse the analysis dict."""
+    result = llm_gpt.invoke(refund_prompt.format_messages(
+        query=query,
+        product_info=product_info if product_info else "No product information available"
+    ))
+    return _parse_refund(result.content.strip())
+
+
+def refund_agent(state: AgentState) -> dict:
+    """Analyze refund request and determine eligibility.
+
+    Args:
+        state: Current agent state containing query and product_info
+
+    Returns:
+        Dictionary with 'refund' key containing refund analysis
+    """
+    query = state.query
+    product_info = state.product_info
+
+    # product_info is part of the prompt, so it is part of the cache key
+    key_parts = (query, json.dumps(product_info, sort_keys=True, default=str))
+    refund_data = cached_invoke("refund", key_parts, lambda: _analyze_refund(query, product_info))
+    return {"refund": refund_data}
+
+
+async def _aanalyze_refund(query: str, product_info) -> dict:
+    """Async variant of _analyze_refund."""
+    result = await llm_gpt.ainvoke(refund_prompt.format_messages(
+        query=query,
+        product_info=product_info if product_info else "No product information available"
+    ))
+    return _parse_refund(result.content.strip())
+
+
+async def arefund_agent(state: AgentState) -> dict:
+    """Async variant of refund_agent so the LLM call can overlap other I/O."""
+    query = state.query
+    product_info = state.product_info
+
+    key_parts = (query, json.dumps(product_info, sort_keys=True, default=str))
+    refund_data = await acached_invoke("refund", key_parts, lambda: _aanalyze_refund(query, product_info))
     return {"refund": refund_data}
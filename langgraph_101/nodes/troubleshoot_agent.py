@@ -8,9 +8,18 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import json
+from langchain_core.messages import HumanMessage
 from langchain_core.prompts import ChatPromptTemplate
 from llm import llm_gpt
 from state import AgentState
+from utils.llm_cache import acached_invoke, cached_invoke
+
+# Optional: msgspec decodes and type-checks the error-code array in one C pass
+try:
+    import msgspec
+    _ERRORS_DECODER = msgspec.json.Decoder(list)
+except ImportError:
+    msgspec = None
 
 troubleshoot_prompt = ChatPromptTemplate.from_template("""
 You are a technical troubleshooting agent.
@@ -33,23 +42,59 @@ Rules:
 User query: {query}
 """)
 
+# Rendered once at import; per call the prompt is one string concat
+_SENTINEL = "\x00QUERY\x00"
+_PREFIX, _SUFFIX = troubleshoot_prompt.messages[0].prompt.format(query=_SENTINEL).split(_SENTINEL)
+
+
+def _parse_errors(content: str) -> list:
+    """Parse the error-code reply (shared by sync and async paths)."""
+    if msgspec is not None:
+        try:
+            return _ERRORS_DECODER.decode(content)
+        except msgspec.ValidationError:
+            return []  # valid JSON but not a list, as before
+        except msgspec.DecodeError:
+            return ["unknown_issue"]
+
+    try:
+        errors = json.loads(content)
+        if not isinstance(errors, list):
+            errors = []
+    except json.JSONDecodeError:
+        errors = ["unknown_issue"]
+
+    return errors
+
+
+def _identify_errors(query: str) -> list:
+    """Run the troubleshooting LLM call and parse the error codes."""
+    result = llm_gpt.invoke([HumanMessage(content=_PREFIX + query + _SUFFIX)])
+    return _parse_errors(result.content.strip())
+
 
 def troubleshoot_agent(state: AgentState) -> dict:
     """Identify technical issues from user query.
-    
+
     Args:
         state: Current agent state containing the user query
-        
+
     Returns:
         Dictionary with 'errors' key containing list of error codes
     """
-    result = llm_gpt.invoke(troubleshoot_prompt.format_messages(query=state["query"]))
-    
-    try:
-        errors = json.loads(result.content.strip())
-        if not isinstance(errors, list):
-            errors = []
-    except json.JSONDecodeError:
-        errors = ["unknown_issue"]
-    
+    query = state.query
+    errors = cached_invoke("troubleshoot", (query,), lambda: _identify_errors(query))
+    return {"errors": errors}
+
+
+async def _aidentify_errors(query: str) -> list:
+    """Async variant of _identify_errors."""
+    result = await llm_gpt.ainvoke([HumanMessage(content=_PREFIX + query + _SUFFIX)])
+    return _parse_errors(result.content.strip())
+
+
+async def atroubleshoot_agent(state: AgentState) -> dict:
+    """Async variant of troubleshoot_agent so the LLM call can overlap other I/O."""
+    query = state.query
+    errors = await acached_invoke("troubleshoot", (query,), lambda: _aidentify_errors(query))
     return {"errors": errors}
\ No newline at end of file
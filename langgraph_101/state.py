@@ -3,19 +3,23 @@
 Defines the shared state structure used across all agents in the graph.
 """
 
-from typing import TypedDict, Optional, Dict, Any, List
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List
 
 
-class AgentState(TypedDict, total=False):
+@dataclass(slots=True)
+class AgentState:
     """State shared across all agents in the customer support graph.
-    
+
     All fields except 'query' are optional and can be set by different agents.
+    A slotted dataclass instead of a TypedDict: no per-instance __dict__, and
+    nodes read fields via attribute access rather than dict lookups.
     """
-    query: str  # User's original query
-    intent: Optional[str]  # Classified intent (set by intent_agent)
-    entities: Dict[str, Any]  # Extracted entities (set by entity_agent)
-    product_info: Optional[Dict[str, Any]]  # Product data (set by product_info_agent)
-    user_history: Optional[Dict[str, Any]]  # User history (set by user_history_agent)
-    errors: List[str]  # Error codes (set by troubleshoot_agent)
-    refund: Optional[Dict[str, Any]]  # Refund analysis (set by refund_agent)
-    reply: Optional[str]  # Final response (set by reply_agent)
\ No newline at end of file
+    query: str = ""  # User's original query
+    intent: Optional[str] = None  # Classified intent (set by intent_agent)
+    entities: Dict[str, Any] = field(default_factory=dict)  # Extracted entities (set by entity_agent)
+    product_info: Optional[Dict[str, Any]] = None  # Product data (set by product_info_agent)
+    user_history: Optional[Dict[str, Any]] = None  # User history (set by user_history_agent)
+    errors: List[str] = field(default_factory=list)  # Error codes (set by troubleshoot_agent)
+    refund: Optional[Dict[str, Any]] = None  # Refund analysis (set by refund_agent)
+    reply: Optional[str] = None  # Final response (set by reply_agent)
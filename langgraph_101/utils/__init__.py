@@ -0,0 +1 @@
+"""Shared utilities for the langgraph_101 graph."""
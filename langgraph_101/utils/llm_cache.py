@@ -0,0 +1,66 @@
+"""In-process memoization for per-node LLM results.
+
+LLM round trips dominate this graph's latency, and repeated queries (demo
+runs, benchmarks, users re-asking the same thing) recompute identical
+results. Each node memoizes its parsed result keyed by a hash of its prompt
+inputs, so an exact repeat returns in microseconds instead of ~0.3-0.5s.
+Bounded LRU so a long session cannot grow the cache without limit.
+"""
+
+import hashlib
+from collections import OrderedDict
+
+_CACHE: "OrderedDict[bytes, object]" = OrderedDict()
+_CACHE_MAX = 1024
+
+# Sentinel distinguishing "not cached" from legitimately falsy results
+_MISS = object()
+
+
+def cache_key(node_name: str, *parts) -> bytes:
+    """Hash a node name plus its prompt inputs into a fixed-size key."""
+    digest = hashlib.blake2b(node_name.encode(), digest_size=16)
+    for part in parts:
+        digest.update(b"|")
+        digest.update(str(part).encode())
+    return digest.digest()
+
+
+def cached_invoke(node_name: str, key_parts: tuple, compute):
+    """Return the memoized result for (node_name, key_parts), computing on miss.
+
+    compute() should run the LLM call and return the parsed value (str, dict,
+    or list) rather than raw message content, so cache hits skip re-parsing as
+    well as the network round trip. Callers must treat returned dicts/lists
+    as read-only since hits share the stored object.
+    """
+    key = cache_key(node_name, *key_parts)
+    value = _CACHE.get(key, _MISS)
+    if value is not _MISS:
+        _CACHE.move_to_end(key)
+        return value
+
+    value = compute()
+    _CACHE[key] = value
+    if len(_CACHE) > _CACHE_MAX:
+        _CACHE.popitem(last=False)
+    return value
+
+
+async def acached_invoke(node_name: str, key_parts: tuple, compute):
+    """Async variant of cached_invoke; compute is awaited on a miss.
+
+    Shares the cache with the sync variant, so a result computed on either
+    path serves hits on both.
+    """
+    key = cache_key(node_name, *key_parts)
+    value = _CACHE.get(key, _MISS)
+    if value is not _MISS:
+        _CACHE.move_to_end(key)
+        return value
+
+    value = await compute()
+    _CACHE[key] = value
+    if len(_CACHE) > _CACHE_MAX:
+        _CACHE.popitem(last=False)
+    return value